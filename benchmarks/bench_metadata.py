@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import random
+import argparse
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from modules.channel_tracker import metadata_optimization  # noqa: E402
+from modules.video_frame import to_records  # noqa: E402
+
+WORDS = ["review", "unboxing", "tutorial", "vlog", "tips", "guide", "best", "budget", "setup", "2025", "iphone", "pc"]
+HASHTAGS = ["#tech", "#shorts", "#review", "#gaming", "#howto", "#diy", "#vlog", "#music"]
+
+
+def make_videos(n, seed=42):
+    # Synthetic channel: some duplicate titles, empty descriptions, missing tags and a shared footer
+    rng = random.Random(seed)
+    published = pd.Timestamp("2015-01-01", tz="UTC") + pd.to_timedelta(np.sort(rng.sample(range(10 * 365 * 24), n) if n <= 87600 else [rng.randrange(10 * 365 * 24) for _ in range(n)]), unit="h")
+    frame = pd.DataFrame({
+        "video_id": [f"vid{i:07d}" for i in range(n)],
+        "title": [" ".join(rng.choices(WORDS, k=4)) for _ in range(n)],
+        "description": [
+            "" if rng.random() < 0.05 else
+            " ".join(rng.choices(WORDS, k=30)) + " " + " ".join(rng.sample(HASHTAGS, 3)) + "\nFollow me on socials!"
+            for _ in range(n)
+        ],
+        "tags": pd.Series([() if rng.random() < 0.1 else tuple(rng.sample(WORDS, 3)) for _ in range(n)], dtype=object),
+        "published_at": published,
+        "view_count": np.array([rng.randrange(1_000_000) for _ in range(n)], dtype=np.int64),
+        "like_count": np.array([rng.randrange(50_000) for _ in range(n)], dtype=np.int64)
+    })
+    return frame
+
+
+def legacy_metadata_optimization(video_details):
+    # The original per-video Python loops, kept here as the baseline
+    repeated_titles = set()
+    seen = set()
+    for vid in video_details:
+        if vid["title"] in seen:
+            repeated_titles.add(vid["title"])
+        seen.add(vid["title"])
+
+    missing_descriptions = sum(1 for v in video_details if not v["description"].strip())
+    missing_tags = sum(1 for v in video_details if not v["tags"])
+    hashtags = []
+    for v in video_details:
+        hashtags += [word for word in v["description"].split() if word.startswith("#")]
+    most_common = Counter(hashtags).most_common(5)
+
+    return {
+        "repeated_titles": list(repeated_titles),
+        "missing_descriptions": missing_descriptions,
+        "missing_tags": missing_tags,
+        "common_hashtags": most_common
+    }
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark metadata_optimization scaling.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated video counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the vectorized version")
+    args = parser.parse_args(argv)
+
+    print(f"{'videos':>8} {'legacy (s)':>11} {'vectorized (s)':>15} {'+period M (s)':>14} {'speedup':>8}")
+    for n in (int(size) for size in args.sizes.split(",")):
+        frame = make_videos(n)
+        vectorized = best_of(lambda: metadata_optimization(frame), args.repeat)
+        with_period = best_of(lambda: metadata_optimization(frame, period="M"), args.repeat)
+        if args.skip_legacy:
+            print(f"{n:>8} {'-':>11} {vectorized:>15.3f} {with_period:>14.3f} {'-':>8}")
+            continue
+        records = to_records(frame)
+        legacy = best_of(lambda: legacy_metadata_optimization(records), args.repeat)
+        assert legacy_metadata_optimization(records)["missing_tags"] == metadata_optimization(frame)["missing_tags"]
+        print(f"{n:>8} {legacy:>11.3f} {vectorized:>15.3f} {with_period:>14.3f} {legacy / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
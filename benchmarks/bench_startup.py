@@ -0,0 +1,100 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not load just to show the CLI menu
+HEAVY_MODULES = ("pandas", "numpy", "groq", "dotenv", "requests", "matplotlib", "streamlit", "pyarrow")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"import_seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+# Menu choice -> tool name; the first action is everything up to that tool's first prompt,
+# which is where the lazily imported subsystems are actually loaded
+MENU_ACTIONS = {"1": "title", "2": "description", "3": "tags", "4": "script", "5": "channel", "6": "package"}
+
+ACTION_PROBE = """
+import builtins, contextlib, io, json, sys, time
+
+class FirstPrompt(Exception):
+    pass
+
+answers = [%r]
+def fake_input(prompt=""):
+    if answers:
+        return answers.pop()
+    raise FirstPrompt()
+
+builtins.input = fake_input
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    try:
+        main.main()
+    except FirstPrompt:
+        pass
+elapsed = time.perf_counter() - start
+print(json.dumps({"action_seconds": elapsed}))
+"""
+
+
+def measure_cold_start(runs=5):
+    # Each run is a fresh interpreter, so this is the real cold start of `python main.py` minus the menu
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "import_seconds": min(r["import_seconds"] for r in results),
+        "loaded": sorted(set(m for r in results for m in r["loaded"]))
+    }
+
+
+def measure_first_action(choice, runs=3):
+    # Fresh interpreter per run: start the CLI, pick a menu entry and stop at the tool's first prompt
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", ACTION_PROBE % choice], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1])["action_seconds"])
+    return min(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the CLI's cold-start import budget.")
+    parser.add_argument("--budget", type=float, default=0.05, help="Max seconds to import main.py")
+    parser.add_argument("--action-budget", type=float, default=3.0,
+                        help="Max seconds from launch to the first prompt of any menu tool")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = measure_cold_start(args.runs)
+    print(f"import main: {result['import_seconds'] * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)")
+    failed = False
+    for choice, tool in MENU_ACTIONS.items():
+        seconds = measure_first_action(choice, max(args.runs // 2, 1))
+        print(f"first action '{tool}': {seconds * 1000:.1f} ms")
+        if seconds > args.action_budget:
+            print(f"❌ '{tool}' is over the first-action budget ({args.action_budget * 1000:.0f} ms)")
+            failed = True
+    if result["loaded"]:
+        print(f"❌ Heavy modules loaded at startup: {', '.join(result['loaded'])}")
+        failed = True
+    if result["import_seconds"] > args.budget:
+        print("❌ Over the import-time budget")
+        failed = True
+    if not failed:
+        print("✅ Startup within budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-ins for the Groq chat-completions endpoint and the YouTube Data API endpoints the app uses.
+# Point the app at them with GROQ_API_URL=<base>/openai/v1/chat/completions and YOUTUBE_API_BASE=<base>/youtube/v3.
+
+WORDS = ["review", "unboxing", "tutorial", "vlog", "tips", "guide", "best", "budget", "setup", "2025", "iphone", "pc",
+         "camera", "gaming", "build", "music", "travel", "cooking", "fitness", "coding"]
+HASHTAGS = ["#tech", "#shorts", "#review", "#gaming", "#howto", "#diy", "#vlog", "#music"]
+FOOTER = "\n\nSubscribe for more!\nFollow me on socials: @fakechannel\nGear I use: https://example.com/gear"
+
+
+class FakeConfig:
+    def __init__(self, latency_ms=50, jitter_ms=0, error_rate=0.0, error_status=503, videos_per_channel=500,
+                 page_size=50, completion_words=120, stream_chunk_words=4, stream_delay_ms=5, seed=7,
+                 tail_rate=0.0, tail_ms=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        # Long tail: this share of requests waits tail_ms extra (what hedged requests are for)
+        self.tail_rate = tail_rate
+        self.tail_ms = tail_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.videos_per_channel = videos_per_channel
+        # Caps maxResults, i.e. controls how many playlistItems pages a crawl walks
+        self.page_size = page_size
+        self.completion_words = completion_words
+        self.stream_chunk_words = stream_chunk_words
+        self.stream_delay_ms = stream_delay_ms
+        self.seed = seed
+
+
+class FakeApiState:
+    # Deterministic synthetic channels plus request counters for the benchmark report
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.counts = {}
+        self.errors_injected = 0
+        self._videos = {}
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def should_fail(self):
+        with self.lock:
+            fail = self.config.error_rate and self.rng.random() < self.config.error_rate
+            if fail:
+                self.errors_injected += 1
+        return fail
+
+    def delay(self):
+        jitter = random.uniform(-self.config.jitter_ms, self.config.jitter_ms) if self.config.jitter_ms else 0
+        tail = self.config.tail_ms if self.config.tail_rate and random.random() < self.config.tail_rate else 0
+        time.sleep(max(self.config.latency_ms + jitter + tail, 0) / 1000)
+
+    def channel_videos(self, channel_id):
+        # Newest first, like an uploads playlist
+        with self.lock:
+            videos = self._videos.get(channel_id)
+            if videos is None:
+                rng = random.Random(f"{self.config.seed}:{channel_id}")
+                start = datetime(2024, 12, 31, tzinfo=timezone.utc)
+                videos = []
+                for i in range(self.config.videos_per_channel):
+                    title = " ".join(rng.choices(WORDS, k=5))
+                    description = "" if rng.random() < 0.05 else (
+                        " ".join(rng.choices(WORDS, k=40)) + " " + " ".join(rng.sample(HASHTAGS, 2)) + FOOTER)
+                    videos.append({
+                        "id": f"{channel_id[-6:]}v{i:06d}",
+                        "snippet": {
+                            "title": title,
+                            "description": description,
+                            "tags": [] if rng.random() < 0.1 else rng.sample(WORDS, 4),
+                            "publishedAt": (start - timedelta(hours=36 * i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+                        },
+                        "statistics": {"viewCount": str(rng.randrange(1_000_000)),
+                                       "likeCount": str(rng.randrange(50_000))}
+                    })
+                self._videos[channel_id] = videos
+        return videos
+
+    def video_by_id(self, video_id):
+        # Ids embed the channel suffix, so lookups never need a global index
+        suffix, _, index = video_id.partition("v")
+        for channel_id, videos in list(self._videos.items()):
+            if channel_id.endswith(suffix) and index.isdigit() and int(index) < len(videos):
+                return videos[int(index)]
+        return None
+
+    def snapshot(self):
+        with self.lock:
+            return {"requests": dict(self.counts), "errors_injected": self.errors_injected}
+
+
+def _channel_id(name):
+    return "UC" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:22]
+
+
+def _completion_text(state, messages):
+    # Word count is fixed by the config; content varies with the prompt so caches see distinct entries
+    rng = random.Random(json.dumps(messages, sort_keys=True))
+    words = rng.choices(WORDS, k=state.config.completion_words)
+    lines = [" ".join(words[i:i + 8]).capitalize() for i in range(0, len(words), 8)]
+    return "\n".join(lines)
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this Nagle + delayed ACK adds ~40 ms per response
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_youtube(self, body):
+        etag = '"' + hashlib.md5(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_json(200, dict(body, etag=etag), {"ETag": etag})
+
+    def _inject_error(self, youtube):
+        status = self.state.config.error_status
+        if youtube:
+            reason = "rateLimitExceeded" if status in (403, 429) else "backendError"
+            body = {"error": {"code": status, "message": "Injected failure", "errors": [{"reason": reason}]}}
+        else:
+            body = {"error": {"message": "Injected failure", "type": "server_error"}}
+        self._send_json(status, body, {"Retry-After": "0"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+        if not url.path.startswith("/youtube/v3/"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        self.state.count(endpoint)
+        self.state.delay()
+        if self.state.should_fail():
+            self._inject_error(youtube=True)
+            return
+
+        if endpoint == "search":
+            channel_id = _channel_id(params.get("q", ""))
+            self._send_youtube({"items": [{"snippet": {"channelId": channel_id, "title": params.get("q", "")}}]})
+        elif endpoint == "channels":
+            channel_id = params.get("id") or _channel_id(params.get("forUsername", ""))
+            videos = self.state.channel_videos(channel_id)
+            self._send_youtube({"items": [{
+                "id": channel_id,
+                "snippet": {"title": f"Fake {channel_id[-6:]}", "description": "Synthetic channel",
+                            "publishedAt": "2015-01-01T00:00:00Z"},
+                "statistics": {"subscriberCount": "123456", "viewCount": "98765432",
+                               "videoCount": str(len(videos))},
+                "contentDetails": {"relatedPlaylists": {"uploads": "UU" + channel_id[2:]}}
+            }]})
+        elif endpoint == "playlistItems":
+            videos = self.state.channel_videos("UC" + params.get("playlistId", "UU")[2:])
+            size = min(int(params.get("maxResults", 5)), self.state.config.page_size)
+            offset = int(params.get("pageToken") or 0)
+            body = {"items": [{"snippet": {
+                "title": v["snippet"]["title"],
+                "description": v["snippet"]["description"],
+                "publishedAt": v["snippet"]["publishedAt"],
+                "resourceId": {"videoId": v["id"]}
+            }} for v in videos[offset:offset + size]]}
+            if offset + size < len(videos):
+                body["nextPageToken"] = str(offset + size)
+            self._send_youtube(body)
+        elif endpoint == "videos":
+            items = [self.state.video_by_id(video_id) for video_id in params.get("id", "").split(",") if video_id]
+            self._send_youtube({"items": [item for item in items if item]})
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown endpoint {endpoint}"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if urlparse(self.path).path.rstrip("/") != "/openai/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        self.state.count("chat_completions")
+        self.state.delay()
+        if self.state.should_fail():
+            self._inject_error(youtube=False)
+            return
+
+        messages = payload.get("messages", [])
+        text = _completion_text(self.state, messages)
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(text.split()),
+                 "total_tokens": prompt_tokens + len(text.split())}
+        if not payload.get("stream"):
+            self._send_json(200, {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "model": payload.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage
+            })
+            return
+
+        # Server-sent events, one delta per few words, without Content-Length (connection closes at the end)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        tokens = text.split(" ")
+        step = self.state.config.stream_chunk_words
+        try:
+            for i in range(0, len(tokens), step):
+                piece = " ".join(tokens[i:i + step]) + (" " if i + step < len(tokens) else "")
+                event = {"choices": [{"index": 0, "delta": {"content": piece}}]}
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(self.state.config.stream_delay_ms / 1000)
+            final = {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "x_groq": {"usage": usage}}
+            self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stopped reading early (e.g. a cancelled stream)
+            pass
+        self.close_connection = True
+
+
+class FakeApiServer:
+    # Runs both fakes on one ThreadingHTTPServer in a background thread
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or FakeConfig()
+        self.state = FakeApiState(self.config)
+        handler = type("BoundFakeApiHandler", (FakeApiHandler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def groq_url(self):
+        return f"{self.base_url}/openai/v1/chat/completions"
+
+    @property
+    def youtube_base(self):
+        return f"{self.base_url}/youtube/v3"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run local fake Groq and YouTube APIs.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Share of requests delayed by --tail-ms")
+    parser.add_argument("--tail-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--videos", type=int, default=500, help="Videos per fake channel")
+    parser.add_argument("--page-size", type=int, default=50, help="Max playlistItems per page")
+    args = parser.parse_args(argv)
+
+    config = FakeConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                        error_status=args.error_status, videos_per_channel=args.videos, page_size=args.page_size,
+                        tail_rate=args.tail_rate, tail_ms=args.tail_ms)
+    server = FakeApiServer(config, port=args.port)
+    print(f"GROQ_API_URL={server.groq_url}")
+    print(f"YOUTUBE_API_BASE={server.youtube_base}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
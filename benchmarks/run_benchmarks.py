@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.fake_servers import FakeApiServer, FakeConfig  # noqa: E402
+
+IDEA = "How to build a budget gaming PC in 2025"
+KEYWORDS = "budget pc, gaming, build guide"
+
+
+def summarize(samples, items=1):
+    samples = sorted(samples)
+    p95_index = min(len(samples) - 1, max(0, round(0.95 * len(samples)) - 1))
+    total = sum(samples)
+    return {
+        "runs": len(samples),
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[p95_index] * 1000,
+        "mean_ms": total / len(samples) * 1000,
+        "throughput_per_s": items * len(samples) / total if total else 0.0
+    }
+
+
+def measure(fn, runs, items=1):
+    samples = []
+    failures = 0
+    for i in range(runs):
+        start = time.perf_counter()
+        try:
+            fn(i)
+        except Exception:
+            failures += 1
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples, items)
+    result["failures"] = failures
+    return result
+
+
+def configure_environment(server, workdir):
+    # Must run before any modules.* import: endpoints, keys and cache paths are read at import time
+    os.environ.update({
+        "GROQ_API_URL": server.groq_url,
+        "YOUTUBE_API_BASE": server.youtube_base,
+        "GROQ_API_KEY": "bench-groq-key",
+        "YOUTUBE_API_KEY": "bench-youtube-key",
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite3"),
+        "SEMANTIC_CACHE_PATH": os.path.join(workdir, "semantic_cache.sqlite3"),
+        "CHANNEL_STORE_PATH": os.path.join(workdir, "channels.sqlite3"),
+        "YOUTUBE_HTTP_CACHE_PATH": os.path.join(workdir, "youtube_http_cache.sqlite3"),
+        "YOUTUBE_REQUESTS_PER_SECOND": "0",
+        "YOUTUBE_DAILY_QUOTA": "100000000",
+        "YOUTUBE_BACKOFF_BASE": "0.01",
+        "YOUTUBE_BACKOFF_CAP": "0.05"
+    })
+
+
+def bench_generators(runs):
+    from modules.title_generator import generate_youtube_titles
+    from modules.description_generator import generate_youtube_description
+    from modules.tag_suggester import suggest_youtube_tags
+    from modules.script_generator import generate_script, stream_script
+    from modules.video_package import generate_video_package
+
+    results = {
+        "generate_youtube_titles": measure(lambda i: generate_youtube_titles(f"{IDEA} #{i}", force_fresh=True), runs),
+        "generate_youtube_description": measure(
+            lambda i: generate_youtube_description(f"{IDEA} #{i}", KEYWORDS, force_fresh=True), runs),
+        "suggest_youtube_tags": measure(lambda i: suggest_youtube_tags(f"{IDEA} #{i}", force_fresh=True), runs),
+        "generate_script": measure(lambda i: generate_script(f"{IDEA} #{i}", KEYWORDS, force_fresh=True), runs),
+        "generate_youtube_titles_cached": measure(lambda i: generate_youtube_titles(IDEA), runs)
+    }
+
+    first_chunk = []
+
+    def stream_once(i):
+        start = time.perf_counter()
+        for n, _ in enumerate(stream_script(f"{IDEA} stream #{i}", KEYWORDS, force_fresh=True)):
+            if n == 0:
+                first_chunk.append(time.perf_counter() - start)
+
+    results["stream_script"] = measure(stream_once, runs)
+    if first_chunk:
+        results["stream_script_first_chunk"] = summarize(first_chunk)
+    results["generate_video_package"] = measure(
+        lambda i: generate_video_package(f"{IDEA} package #{i}", KEYWORDS, force_fresh=True), runs, items=4)
+    return results
+
+
+def bench_channel_pipeline(runs, videos_per_channel):
+    from modules.channel_sync import sync_channel
+    from modules.channel_tracker import (
+        crawl_channel_videos, get_channel_data, metadata_optimization, analyze_channel_with_llm
+    )
+    from modules.near_duplicates import find_near_duplicate_videos
+    from modules.report_export import export_channel_stream
+
+    results = {
+        # Every run uses a new handle, so this is the cold path: search, channel, full crawl, store
+        "sync_channel_full": measure(
+            lambda i: sync_channel(f"https://youtube.com/@bench-full-{i}", as_frame=True), runs,
+            items=videos_per_channel),
+        # Same handle again: alias lookup, one conditional channels call, first playlist page only
+        "sync_channel_incremental": measure(
+            lambda i: sync_channel("https://youtube.com/@bench-full-0", as_frame=True), runs)
+    }
+
+    channel = get_channel_data("https://youtube.com/@bench-crawl")
+    results["crawl_channel_videos"] = measure(
+        lambda i: crawl_channel_videos(channel["uploads_playlist_id"], as_frame=True), runs,
+        items=videos_per_channel)
+
+    frame = crawl_channel_videos(channel["uploads_playlist_id"], as_frame=True)
+    results["metadata_optimization"] = measure(lambda i: metadata_optimization(frame, period="M"), runs,
+                                               items=len(frame))
+    results["find_near_duplicate_videos"] = measure(lambda i: find_near_duplicate_videos(frame), runs,
+                                                    items=len(frame))
+
+    # Map-reduce over the boilerplate-stripped descriptions of every video
+    results["analyze_channel_with_llm"] = measure(lambda i: analyze_channel_with_llm(frame, force_fresh=True), runs,
+                                                  items=len(frame))
+
+    workdir = os.path.dirname(os.environ["CHANNEL_STORE_PATH"])
+    results["export_channel_stream_csv"] = measure(
+        lambda i: export_channel_stream(channel["uploads_playlist_id"], os.path.join(workdir, f"report{i}.csv")),
+        runs, items=videos_per_channel)
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta_ms=5.0):
+    # A regression is a p50 more than `tolerance` slower than the stored baseline;
+    # sub-millisecond benchmarks (cache hits) also need an absolute slowdown of min_delta_ms to count
+    regressions = []
+    for suite, benchmarks in results.items():
+        if suite == "server":
+            continue
+        for name, current in benchmarks.items():
+            previous = baseline.get(suite, {}).get(name)
+            if not previous or not previous.get("p50_ms"):
+                continue
+            ratio = current["p50_ms"] / previous["p50_ms"]
+            if ratio > 1 + tolerance and current["p50_ms"] - previous["p50_ms"] > min_delta_ms:
+                regressions.append((f"{suite}.{name}", previous["p50_ms"], current["p50_ms"], ratio))
+    return regressions
+
+
+def print_results(results):
+    print(f"{'benchmark':<45}{'runs':>6}{'p50 ms':>11}{'p95 ms':>11}{'items/s':>11}{'fail':>6}")
+    for suite, benchmarks in results.items():
+        if suite == "server":
+            continue
+        for name, r in benchmarks.items():
+            print(f"{suite + '.' + name:<45}{r['runs']:>6}{r['p50_ms']:>11.1f}{r['p95_ms']:>11.1f}"
+                  f"{r['throughput_per_s']:>11.1f}{r.get('failures', 0):>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generators and channel pipeline against local fakes.")
+    parser.add_argument("--suite", choices=["all", "generators", "channel"], default="all")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--videos", type=int, default=500, help="Videos per fake channel")
+    parser.add_argument("--page-size", type=int, default=50, help="Max playlistItems per page (pagination depth)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown vs baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore p50 slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    config = FakeConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                        error_status=args.error_status, videos_per_channel=args.videos, page_size=args.page_size)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, FakeApiServer(config) as server:
+        configure_environment(server, workdir)
+        if args.suite in ("all", "generators"):
+            results["generators"] = bench_generators(args.runs)
+        if args.suite in ("all", "channel"):
+            results["channel"] = bench_channel_pipeline(args.runs, args.videos)
+        results["server"] = server.state.snapshot()
+
+    print_results(results)
+    print(f"Fake API requests: {results['server']['requests']} "
+          f"(injected errors: {results['server']['errors_injected']})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+        for name, before, after, ratio in regressions:
+            print(f"❌ {name}: p50 {before:.1f} ms -> {after:.1f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,35 @@
-from modules.title_generator import generate_youtube_titles
-from modules.description_generator import generate_youtube_description
-from modules.tag_suggester import suggest_youtube_tags
-from modules.script_generator import generate_script
-from modules.channel_tracker import (
-    get_channel_data,
-    get_videos_from_playlist,
-    get_video_stats,
-    show_top_5_videos,
-    show_upload_frequency,
-    metadata_analysis,
-    analyze_channel_with_llm,
-    export_to_csv
-)
+# Subsystems are imported inside each flow so the menu starts without loading pandas, groq, etc.
+
+
+def print_stream(chunks):
+    # Print tokens as they arrive and return the full text
+    parts = []
+    for chunk in chunks:
+        print(chunk, end="", flush=True)
+        parts.append(chunk)
+    print()
+    return "".join(parts).strip()
+
 
 def title_generator_flow():
+    from modules.title_generator import start_title_session
+
     print("\n🎬 YouTube Assistant – Title Generator")
     print("-" * 50)
     video_idea = input("Enter your video idea: ")
     keywords_input = input("Enter keywords (comma-separated, or leave blank): ")
     keywords = [kw.strip() for kw in keywords_input.split(",")] if keywords_input else []
+    # Feedback rounds refine the last titles instead of regenerating from an ever-longer prompt
+    session = None
+    next_round = None
 
     while True:
         print("\n⏳ Generating titles...\n")
         try:
-            titles = generate_youtube_titles(video_idea, keywords)
+            if session is None:
+                session = start_title_session(video_idea, keywords)
+                next_round = session.generate
+            titles = next_round()
             print("✅ Suggested Titles:\n")
             for i, title in enumerate(titles, 1):
                 print(f"{i}. {title.strip('-•123. ')}")
@@ -41,34 +47,43 @@ def title_generator_flow():
                 break
             elif choice == "2":
                 feedback = input("Enter feedback for how to improve the titles: ")
-                video_idea += f" (Rewrite with this style: {feedback})"
+                next_round = lambda: session.refine(feedback)
             elif choice == "3":
                 video_idea = input("Enter your new video idea: ")
                 keywords_input = input("Enter new keywords (comma-separated, or leave blank): ")
                 keywords = [kw.strip() for kw in keywords_input.split(",")] if keywords_input else []
+                session = None
             elif choice == "4":
                 print("🔙 Returning to main menu...\n")
                 break
             else:
                 print("❌ Invalid option. Try again.")
+                next_round = session.current
         except Exception as e:
             print(f"❌ Error: {e}")
             break
 
 
 def description_generator_flow():
+    from modules.description_generator import start_description_session
+
     print("\n📄 YouTube Assistant – Description Generator")
     print("-" * 50)
     video_idea = input("Enter your video idea or brief summary: ")
     keywords_input = input("Enter keywords (comma-separated, or leave blank): ")
     keywords = [kw.strip() for kw in keywords_input.split(",")] if keywords_input else []
 
+    session = None
+    next_round = None
+
     while True:
         print("\n⏳ Generating description...\n")
         try:
-            description = generate_youtube_description(video_idea, keywords)
+            if session is None:
+                session = start_description_session(video_idea, keywords)
+                next_round = session.stream
             print("✅ Suggested Description:\n")
-            print(description)
+            description = print_stream(next_round())
 
             print("\n💬 What would you like to do next?")
             print("1. Accept this description")
@@ -83,32 +98,39 @@ def description_generator_flow():
                 break
             elif choice == "2":
                 feedback = input("Enter feedback for how to improve the description: ")
-                description = generate_youtube_description(video_idea, keywords, style_feedback=feedback)
-                print("\n✅ Updated Description:\n")
-                print(description)
+                next_round = lambda: session.stream_refine(feedback)
             elif choice == "3":
                 video_idea = input("Enter your new video idea: ")
                 keywords_input = input("Enter new keywords (comma-separated): ")
                 keywords = [kw.strip() for kw in keywords_input.split(",")] if keywords_input else []
+                session = None
             elif choice == "4":
                 print("🔙 Returning to main menu...\n")
                 break
             else:
                 print("❌ Invalid option. Try again.")
+                next_round = lambda: [session.current()]
         except Exception as e:
             print(f"❌ Error: {e}")
             break
 
 
 def tag_suggester_flow():
+    from modules.tag_suggester import start_tag_session
+
     print("\n🏷️ YouTube Assistant – Tag Suggestion Engine")
     print("-" * 50)
     content_input = input("Enter your video title or description: ")
+    session = None
+    next_round = None
 
     while True:
         print("\n⏳ Generating tags...\n")
         try:
-            tags = suggest_youtube_tags(content_input)
+            if session is None:
+                session = start_tag_session(content_input)
+                next_round = session.generate
+            tags = next_round()
             print("✅ Suggested Tags:\n")
             print(tags)
 
@@ -125,22 +147,24 @@ def tag_suggester_flow():
                 break
             elif choice == "2":
                 feedback = input("Enter feedback for how to improve the tags: ")
-                tags = suggest_youtube_tags(content_input, style_feedback=feedback)
-                print("\n✅ Updated Tags:\n")
-                print(tags)
+                next_round = lambda: session.refine(feedback)
             elif choice == "3":
                 content_input = input("Enter new video title or description: ")
+                session = None
             elif choice == "4":
                 print("🔙 Returning to main menu...\n")
                 break
             else:
                 print("❌ Invalid option. Try again.")
+                next_round = session.current
         except Exception as e:
             print(f"❌ Error: {e}")
             break
 
 
 def script_generator_flow():
+    from modules.script_generator import start_script_session
+
     print("\n🎤 YouTube Assistant – Script Generator")
     print("-" * 50)
     video_idea = input("Enter your video idea or title: ")
@@ -148,13 +172,17 @@ def script_generator_flow():
     tone = input("What tone/style do you want? (e.g., motivational, funny, storytelling, expert-level): ")
 
     keywords = [kw.strip() for kw in keywords_input.split(",")] if keywords_input else []
+    session = None
+    next_round = None
 
     while True:
         print("\n⏳ Generating script...\n")
         try:
-            script = generate_script(video_idea, keywords, tone_feedback=tone)
+            if session is None:
+                session = start_script_session(video_idea, keywords, tone_feedback=tone)
+                next_round = session.stream
             print("✅ Suggested Script:\n")
-            print(script)
+            script = print_stream(next_round())
 
             print("\n💬 What would you like to do next?")
             print("1. Accept this script")
@@ -169,51 +197,111 @@ def script_generator_flow():
                 break
             elif choice == "2":
                 tone = input("Enter new tone/style (e.g., emotional, fast-paced, expert-level): ")
+                next_round = lambda: session.stream_refine(f"rewrite it in this tone/style: {tone}")
             elif choice == "3":
                 video_idea = input("Enter new video idea: ")
                 keywords_input = input("Enter keywords (comma-separated): ")
                 tone = input("Enter tone/style: ")
                 keywords = [kw.strip() for kw in keywords_input.split(",")] if keywords_input else []
+                session = None
             elif choice == "4":
                 print("🔙 Returning to main menu...\n")
                 break
             else:
                 print("❌ Invalid choice.")
+                next_round = lambda: [session.current()]
         except Exception as e:
             print(f"❌ Error: {e}")
             break
 
 
 def channel_tracker_flow():
+    from modules.channel_sync import sync_channel
+    from modules.channel_tracker import (
+        show_top_5_videos,
+        upload_frequency_chart,
+        metadata_optimization,
+        analyze_channel_with_llm
+    )
+    from modules.report_export import export_csv_file, report_file_name
+
     print("\n📊 YouTube Assistant – Channel Performance Tracker")
     print("-" * 50)
     channel_input = input("Enter YouTube channel username or URL: ")
 
     try:
-        channel = get_channel_data(channel_input)
+        def report(progress):
+            print(f"\r⏳ Pages: {progress['pages']} | Listed: {progress['videos_listed']} | "
+                  f"Stats fetched: {progress['videos_fetched']}/{progress['total_videos']}", end="", flush=True)
+
+        channel, video_details, sync = sync_channel(channel_input, progress_callback=report, as_frame=True)
+        print(f"\n🔄 Sync: {sync['new_videos']} new videos, {sync['refreshed_videos']} refreshed")
+
         print(f"\n✅ Channel: {channel['channel_title']}")
         print(f"📅 Created: {channel['published_at']}")
         print(f"👥 Subscribers: {channel['subscriber_count']}")
         print(f"▶️ Videos: {channel['video_count']}")
         print(f"👁️ Total Views: {channel['view_count']}")
 
-        videos_basic = get_videos_from_playlist(channel["uploads_playlist_id"])
-        video_ids = [v["video_id"] for v in videos_basic]
-        video_details = get_video_stats(video_ids)
+        print("\n🥇 Top 5 Videos:")
+        for i, video in enumerate(show_top_5_videos(video_details).itertuples(), 1):
+            print(f"{i}. {video.title} – {video.view_count} views, {video.like_count} likes")
 
-        show_top_5_videos(video_details)
-        show_upload_frequency(video_details)
-        metadata_analysis(video_details)
-        export_to_csv(video_details, channel["channel_title"])
+        print("\n📅 Upload Frequency:")
+        print(upload_frequency_chart(video_details).to_string())
+
+        meta = metadata_optimization(video_details)
+        print("\n🧠 Metadata Optimization:")
+        if meta["repeated_titles"]:
+            print(f"⚠️ Repeated Titles Detected: {', '.join(meta['repeated_titles'])}")
+        else:
+            print("✅ All video titles are unique!")
+        print(f"📝 Videos missing descriptions: {meta['missing_descriptions']}")
+        print(f"🏷️ Videos missing tags: {meta['missing_tags']}")
+        for tag, count in meta["common_hashtags"]:
+            print(f"{tag}: {count} times")
+
+        csv_path = export_csv_file(video_details, report_file_name(channel["channel_title"], ".csv", channel["channel_id"]))
+        print(f"\n📁 CSV report saved to {csv_path}")
 
         print("\n🧠 LLM Optimization Feedback:")
-        sample = video_details[:5]
-        print(analyze_channel_with_llm(sample))
+        print(analyze_channel_with_llm(video_details))
 
     except Exception as e:
         print(f"❌ Error: {e}")
 
 
+def video_package_flow():
+    from modules.video_package import generate_video_package
+
+    print("\n📦 YouTube Assistant – Video Package Generator")
+    print("-" * 50)
+    video_idea = input("Enter your video idea: ")
+    keywords_input = input("Enter keywords (comma-separated, or leave blank): ")
+    tone = input("What tone/style do you want for the script? (or leave blank): ")
+    keywords = [kw.strip() for kw in keywords_input.split(",")] if keywords_input else []
+
+    print("\n⏳ Generating titles, description, tags and script together...\n")
+    package = generate_video_package(video_idea, keywords, tone=tone or None)
+
+    if package["titles"]:
+        print("✅ Suggested Titles:\n")
+        for i, title in enumerate(package["titles"], 1):
+            print(f"{i}. {title.strip('-•123. ')}")
+    if package["description"]:
+        print("\n✅ Suggested Description:\n")
+        print(package["description"])
+    if package["tags"]:
+        print("\n✅ Suggested Tags:\n")
+        print(package["tags"])
+    if package["script"]:
+        print("\n✅ Suggested Script:\n")
+        print(package["script"])
+    for part, error in package["errors"].items():
+        print(f"❌ {part} failed: {error}")
+    print(f"\n⏱️ Done in {package['elapsed_seconds']}s")
+
+
 def main():
     print("📺 YouTube Assistant AI – Main Menu")
     print("=" * 50)
@@ -225,9 +313,10 @@ def main():
         print("3. 🏷️ Tag Suggestion Engine")
         print("4. 🎤 Script Generator")
         print("5. 📊 Channel Performance Tracker")
-        print("6. ❌ Exit")
+        print("6. 📦 Video Package Generator")
+        print("7. ❌ Exit")
 
-        choice = input("Enter your choice (1-6): ")
+        choice = input("Enter your choice (1-7): ")
 
         if choice == "1":
             title_generator_flow()
@@ -240,6 +329,8 @@ def main():
         elif choice == "5":
             channel_tracker_flow()
         elif choice == "6":
+            video_package_flow()
+        elif choice == "7":
             print("👋 Exiting YouTube Assistant. Goodbye!")
             break
         else:
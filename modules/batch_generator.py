@@ -0,0 +1,179 @@
+import os
+import csv
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from modules.title_generator import generate_youtube_titles
+from modules.description_generator import generate_youtube_description
+from modules.tag_suggester import suggest_youtube_tags
+from modules.script_generator import generate_script
+
+GENERATORS = {
+    "titles": lambda row, force_fresh: generate_youtube_titles(row["idea"], row["keywords"], force_fresh=force_fresh),
+    "description": lambda row, force_fresh: generate_youtube_description(row["idea"], row["keywords"], force_fresh=force_fresh),
+    "tags": lambda row, force_fresh: suggest_youtube_tags(row["idea"], force_fresh=force_fresh),
+    "script": lambda row, force_fresh: generate_script(row["idea"], row["keywords"], tone_feedback=row["tone"], force_fresh=force_fresh)
+}
+
+
+class RateLimiter:
+    # Spaces calls evenly so all workers together stay under requests_per_minute
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _parse_keywords(value):
+    if isinstance(value, list):
+        return [str(kw).strip() for kw in value if str(kw).strip()]
+    return [kw.strip() for kw in (value or "").split(",") if kw.strip()]
+
+
+def load_ideas(path):
+    # Accepts CSV (header row) or JSONL; each row needs an "idea" and may have "id", "keywords", "tone"
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            raw_rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            raw_rows = list(csv.DictReader(f))
+
+    rows = []
+    for i, raw in enumerate(raw_rows, 1):
+        idea = (raw.get("idea") or raw.get("video_idea") or raw.get("title") or "").strip()
+        if not idea:
+            continue
+        rows.append({
+            "id": str(raw.get("id") or f"row-{i}"),
+            "idea": idea,
+            "keywords": _parse_keywords(raw.get("keywords")),
+            "tone": (raw.get("tone") or "").strip() or None
+        })
+    return rows
+
+
+def load_completed(output_path):
+    # The output JSONL doubles as the checkpoint: row id -> generators that have an output.
+    # A record only holds the generators run in that pass, so later records add to earlier ones.
+    completed = {}
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a truncated last line
+                continue
+            done = completed.setdefault(record["id"], set())
+            done.update(name for name in GENERATORS if name in record)
+            done.difference_update(record.get("errors") or {})
+    return completed
+
+
+def _is_quota_error(message):
+    message = message.lower()
+    return "error 429" in message or "rate limit" in message or "quota" in message
+
+
+def run_batch(input_path, output_path, generators=tuple(GENERATORS), max_workers=4,
+              requests_per_minute=30, force_fresh=False, progress_callback=None):
+    unknown = [name for name in generators if name not in GENERATORS]
+    if unknown:
+        raise ValueError(f"Unknown generators: {', '.join(unknown)}")
+
+    rows = load_ideas(input_path)
+    completed = load_completed(output_path)
+    # Only the selected generators a row has no output for yet are run
+    pending = []
+    for row in rows:
+        missing = [name for name in generators if name not in completed.get(row["id"], ())]
+        if missing:
+            pending.append((row, missing))
+    summary = {"total": len(rows), "skipped": len(rows) - len(pending), "succeeded": 0, "failed": 0, "stopped": False}
+
+    limiter = RateLimiter(requests_per_minute)
+    stop = threading.Event()
+    write_lock = threading.Lock()
+
+    def process(row, missing):
+        record = {"id": row["id"], "idea": row["idea"], "keywords": row["keywords"], "errors": {}}
+        for name in missing:
+            if stop.is_set():
+                record["errors"][name] = "Skipped after quota/rate-limit stop."
+                continue
+            limiter.wait()
+            try:
+                record[name] = GENERATORS[name](row, force_fresh)
+            except Exception as e:
+                record["errors"][name] = str(e)
+                if _is_quota_error(str(e)):
+                    stop.set()
+        return record
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        def write(record):
+            with write_lock:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for row, missing in pending:
+                futures.append(executor.submit(lambda r=row, m=missing: None if stop.is_set() else process(r, m)))
+            for future in as_completed(futures):
+                record = future.result()
+                if record is None:
+                    continue
+                write(record)
+                if record["errors"]:
+                    summary["failed"] += 1
+                else:
+                    summary["succeeded"] += 1
+                if progress_callback:
+                    progress_callback(summary["skipped"] + summary["succeeded"] + summary["failed"], summary["total"])
+
+    summary["stopped"] = stop.is_set()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-generate YouTube metadata from a CSV/JSONL of ideas.")
+    parser.add_argument("input", help="CSV or JSONL file with an 'idea' column/field")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="JSONL results file (also the resume checkpoint)")
+    parser.add_argument("-g", "--generators", default=",".join(GENERATORS),
+                        help=f"Comma-separated subset of: {', '.join(GENERATORS)}")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Rows processed concurrently")
+    parser.add_argument("--rpm", type=float, default=30, help="Max LLM requests per minute (0 = unlimited)")
+    parser.add_argument("--force-fresh", action="store_true", help="Skip the generation cache")
+    args = parser.parse_args(argv)
+
+    generators = [g.strip() for g in args.generators.split(",") if g.strip()]
+
+    def report(done, total):
+        print(f"\r⏳ {done}/{total} ideas done", end="", flush=True)
+
+    summary = run_batch(args.input, args.output, generators, max_workers=args.workers,
+                        requests_per_minute=args.rpm, force_fresh=args.force_fresh, progress_callback=report)
+    print(f"\n✅ {summary['succeeded']} succeeded, ❌ {summary['failed']} failed, "
+          f"⏭️ {summary['skipped']} already done (of {summary['total']})")
+    if summary["stopped"]:
+        print("🛑 Stopped early on a quota/rate-limit error. Re-run the same command to resume.")
+
+
+if __name__ == "__main__":
+    main()
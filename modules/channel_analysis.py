@@ -0,0 +1,188 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from modules import tracing
+from modules.prompt_compaction import strip_boilerplate, dedupe_texts
+from modules.groq_client import chat_completion
+from modules.video_frame import to_video_frame
+
+load_dotenv()
+
+# Prompt budget per map call (input tokens, estimated) and how many map calls may run at once
+ANALYSIS_BATCH_TOKENS = int(os.getenv("ANALYSIS_BATCH_TOKENS", "3000"))
+ANALYSIS_MAX_BATCHES = int(os.getenv("ANALYSIS_MAX_BATCHES", "16"))
+ANALYSIS_MAX_WORKERS = int(os.getenv("ANALYSIS_MAX_WORKERS", "4"))
+ANALYSIS_DESCRIPTION_CHARS = int(os.getenv("ANALYSIS_DESCRIPTION_CHARS", "300"))
+# Descriptions at least this similar (after boilerplate removal) are sent once; 0 keeps exact dedup only
+ANALYSIS_DEDUP_THRESHOLD = float(os.getenv("ANALYSIS_DEDUP_THRESHOLD", "0.9"))
+ANALYSIS_BOILERPLATE_CHARS = int(os.getenv("ANALYSIS_BOILERPLATE_CHARS", "500"))
+
+SYSTEM_PROMPT = "You are a YouTube SEO expert."
+
+SINGLE_PROMPT = (
+    "Analyze the following video titles and descriptions and provide suggestions to improve SEO, "
+    "use of keywords, hashtags, and engagement:\n\n"
+)
+
+MAP_PROMPT = (
+    "Below is batch {batch} of {batches} from one YouTube channel's videos ({count} videos, ranked by views). "
+    "List concise findings for this batch only: title and description patterns that correlate with views, "
+    "weak or missing metadata, keyword and hashtag usage, and concrete fixes. Cite video numbers. "
+    "Use at most 10 bullet points.\n\n"
+)
+
+REDUCE_PROMPT = (
+    "Below are findings from {parts} analyses, each covering a different slice of the same YouTube channel "
+    "({videos} videos in total). Merge them into one whole-channel report: deduplicate, keep the most "
+    "frequent and most impactful points, and give prioritized suggestions to improve SEO, use of keywords, "
+    "hashtags, and engagement.\n\n"
+)
+
+
+def estimate_tokens(text):
+    # ~4 characters per token for English text; good enough for budgeting, no tokenizer needed
+    return len(text) // 4 + 1
+
+
+def format_video(number, title, description, view_count, description_chars=ANALYSIS_DESCRIPTION_CHARS):
+    return f"{number}. Title: {title}\n   Views: {view_count}\n   Description: {description[:description_chars]}\n\n"
+
+
+def boilerplate_note(report, max_chars=ANALYSIS_BOILERPLATE_CHARS):
+    # The removed channel-wide text, shown once per prompt instead of once per video
+    parts = [report["prefix"]] + report["boilerplate_lines"] + [report["suffix"]]
+    shared = "\n".join(part for part in parts if part)
+    if not shared:
+        return ""
+    return f"Text shared by most descriptions (removed from each video below):\n{shared[:max_chars]}\n\n"
+
+
+def pack_batches(entries, budget=ANALYSIS_BATCH_TOKENS, cost_of=estimate_tokens):
+    # Greedy packing in order; an entry larger than the budget gets a batch of its own
+    batches = []
+    current, used = [], 0
+    for entry in entries:
+        cost = cost_of(entry)
+        if current and used + cost > budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(entry)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _video_entries(video_details, description_chars, dedup_threshold=ANALYSIS_DEDUP_THRESHOLD):
+    # Boilerplate is stripped before truncation, so the per-video budget goes to real content;
+    # repeated descriptions are replaced by a reference to the first video that had them
+    frame = to_video_frame(video_details).sort_values("view_count", ascending=False, kind="stable")
+    descriptions, report = strip_boilerplate(frame["description"].tolist())
+    duplicate_of = dedupe_texts(descriptions, dedup_threshold or None)
+    videos = list(zip(frame["title"], descriptions, frame["view_count"]))
+    entries = []
+    for i, (title, description, views) in enumerate(videos):
+        if duplicate_of[i] is not None:
+            description = f"(same as video {duplicate_of[i] + 1})"
+        entries.append(format_video(i + 1, title, description, views, description_chars))
+    return entries, videos, duplicate_of, report
+
+
+def _limit_entries(entries, budget, max_batches):
+    # Bounded latency: past max_batches worth of tokens, sample evenly across the view ranking.
+    # Returns the indices of the entries to keep.
+    capacity = budget * max_batches
+    total = sum(estimate_tokens(entry) for entry in entries)
+    if total <= capacity:
+        return list(range(len(entries)))
+    keep = max(1, int(len(entries) * capacity / total))
+    step = len(entries) / keep
+    return [int(i * step) for i in range(keep)]
+
+
+def _resolve_references(batch, entries, videos, duplicate_of, description_chars):
+    # Each prompt must contain the video a "(same as video N)" line points at. When that video was
+    # trimmed away or packed into another batch, the first copy here is written out in full and
+    # later copies in the batch point at it instead.
+    anchors = {}
+    resolved = []
+    for i in batch:
+        original = duplicate_of[i]
+        if original is None:
+            anchors[i] = i
+            resolved.append(entries[i])
+            continue
+        anchor = anchors.get(original)
+        title, description, views = videos[i]
+        if anchor is None:
+            anchors[original] = i
+            resolved.append(format_video(i + 1, title, description, views, description_chars))
+        elif anchor == original:
+            resolved.append(entries[i])
+        else:
+            resolved.append(format_video(i + 1, title, f"(same as video {anchor + 1})", views, description_chars))
+    return resolved
+
+
+def _ask(prompt, force_fresh):
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    return chat_completion(messages, temperature=0.3, force_fresh=force_fresh).strip()
+
+
+def _reduce(findings, videos, budget, force_fresh):
+    # Merge in rounds so no reduce prompt exceeds the budget either
+    while len(findings) > 1:
+        groups = pack_batches([f"Findings:\n{text}\n\n" for text in findings], budget)
+        if len(groups) == len(findings):
+            # Each finding alone fills a batch; merge pairs rather than looping forever
+            groups = [groups[i:i + 2] for i in range(0, len(groups), 2)]
+            groups = [[entry for group in pair for entry in group] for pair in groups]
+        prompts = [REDUCE_PROMPT.format(parts=len(group), videos=videos) + "".join(group) for group in groups]
+        if len(prompts) == 1:
+            return _ask(prompts[0], force_fresh)
+        with ThreadPoolExecutor(max_workers=ANALYSIS_MAX_WORKERS) as executor:
+            findings = list(executor.map(tracing.propagate(lambda p: _ask(p, force_fresh)), prompts))
+    return findings[0]
+
+
+@tracing.traced("channel.analysis")
+def analyze_channel(video_details, batch_tokens=ANALYSIS_BATCH_TOKENS, max_batches=ANALYSIS_MAX_BATCHES,
+                    description_chars=ANALYSIS_DESCRIPTION_CHARS, force_fresh=False, progress_callback=None):
+    # Map-reduce SEO feedback over the whole channel: token-budgeted batches are analyzed
+    # concurrently, then merged. A channel that fits in one batch gets a single direct call.
+    # progress_callback(done, total) counts LLM steps (map batches + the merge) on the calling thread.
+    entries, videos, duplicate_of, report = _video_entries(video_details, description_chars)
+    if not entries:
+        return "No videos to analyze."
+    note = boilerplate_note(report)
+    budget = max(batch_tokens - estimate_tokens(note), 1)
+    kept = _limit_entries(entries, budget, max_batches)
+    batches = [_resolve_references(batch, entries, videos, duplicate_of, description_chars)
+               for batch in pack_batches(kept, budget, cost_of=lambda i: estimate_tokens(entries[i]))]
+    span = tracing.current_span()
+    span.set("videos", len(kept))
+    span.set("batches", len(batches))
+    span.set("description_chars_saved", report["chars_before"] - report["chars_after"])
+
+    if len(batches) == 1:
+        feedback = _ask(SINGLE_PROMPT + note + "".join(batches[0]), force_fresh)
+        if progress_callback:
+            progress_callback(1, 1)
+        return feedback
+
+    prompts = [MAP_PROMPT.format(batch=i, batches=len(batches), count=len(batch)) + note + "".join(batch)
+               for i, batch in enumerate(batches, 1)]
+    total_steps = len(prompts) + 1
+    with ThreadPoolExecutor(max_workers=ANALYSIS_MAX_WORKERS) as executor:
+        futures = [executor.submit(tracing.propagate(_ask), prompt, force_fresh) for prompt in prompts]
+        for done, _ in enumerate(as_completed(futures), 1):
+            if progress_callback:
+                progress_callback(done, total_steps)
+        findings = [future.result() for future in futures]
+    feedback = _reduce(findings, len(kept), batch_tokens, force_fresh)
+    if progress_callback:
+        progress_callback(total_steps, total_steps)
+    return feedback
@@ -0,0 +1,73 @@
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from modules import tracing
+from modules.channel_sync import sync_channel
+from modules.video_frame import to_video_frame
+from modules.channel_tracker import (
+    YOUTUBE_POOL_SIZE,
+    show_top_5_videos,
+    upload_frequency_chart,
+    metadata_optimization
+)
+
+
+def summarize_channel(channel, videos):
+    videos = to_video_frame(videos)
+    top_videos = show_top_5_videos(videos)
+    meta = metadata_optimization(videos)
+
+    uploads_per_month = 0.0
+    last_upload = None
+    if not videos.empty:
+        freq = upload_frequency_chart(videos)
+        current_month = pd.Timestamp.now().to_period("M")
+        uploads_per_month = round(float(freq[freq.index > current_month - 12].sum()) / 12, 1)
+        last_upload = videos["published_at"].max()
+
+    return {
+        "Channel": channel["channel_title"],
+        "Subscribers": channel["subscriber_count"],
+        "Videos": channel["video_count"],
+        "Total Views": channel["view_count"],
+        "Top Video": top_videos["title"].iloc[0] if not top_videos.empty else "",
+        "Top Video Views": int(top_videos["view_count"].iloc[0]) if not top_videos.empty else 0,
+        "Top 5 Avg Views": round(top_videos["view_count"].mean()) if not top_videos.empty else 0,
+        "Uploads / Month (12m)": uploads_per_month,
+        "Last Upload": last_upload,
+        "Repeated Titles": len(meta["repeated_titles"]),
+        "Missing Descriptions": meta["missing_descriptions"],
+        "Missing Tags": meta["missing_tags"],
+        "Top Hashtag": meta["common_hashtags"][0][0] if meta["common_hashtags"] else ""
+    }
+
+
+@tracing.traced("channel.compare")
+def compare_channels(channel_inputs, max_workers=8, progress_callback=None):
+    # Channels are synced concurrently; they share the pooled YouTube session, ETag cache and quota budget.
+    # progress_callback(done, total, channel_input) runs on the calling thread.
+    channel_inputs = [c.strip() for c in channel_inputs if c.strip()]
+    rows = []
+    errors = {}
+    # Each sync fetches playlist pages on its own thread plus stats on crawl_workers threads, so the
+    # pool size is split across channels to keep total in-flight requests within the connection pool
+    channel_workers = max(min(max_workers, len(channel_inputs)), 1)
+    crawl_workers = max(YOUTUBE_POOL_SIZE // channel_workers - 1, 1)
+    with ThreadPoolExecutor(max_workers=channel_workers) as executor:
+        futures = {
+            executor.submit(tracing.propagate(sync_channel), channel_input, as_frame=True, max_workers=crawl_workers): channel_input
+            for channel_input in channel_inputs
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            channel_input = futures[future]
+            try:
+                channel, videos, _ = future.result()
+                rows.append(summarize_channel(channel, videos))
+            except Exception as e:
+                errors[channel_input] = str(e)
+            if progress_callback:
+                progress_callback(done, len(channel_inputs), channel_input)
+
+    report = pd.DataFrame(rows)
+    if not report.empty:
+        report = report.sort_values("Subscribers", ascending=False).reset_index(drop=True)
+    return report, errors
@@ -0,0 +1,184 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from modules.video_frame import VideoFrameBuilder, is_video_frame
+
+load_dotenv()
+
+CHANNEL_STORE_PATH = os.getenv("CHANNEL_STORE_PATH", os.path.join(".cache", "channels.sqlite3"))
+
+CHANNEL_FIELDS = ("channel_id", "channel_title", "description", "published_at", "subscriber_count",
+                  "view_count", "video_count", "uploads_playlist_id")
+VIDEO_FIELDS = ("video_id", "title", "description", "tags", "published_at", "view_count", "like_count")
+
+_conn = None
+_lock = threading.Lock()
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(CHANNEL_STORE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(CHANNEL_STORE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """CREATE TABLE IF NOT EXISTS channels (
+                channel_id TEXT PRIMARY KEY,
+                channel_title TEXT,
+                description TEXT,
+                published_at TEXT,
+                subscriber_count INTEGER,
+                view_count INTEGER,
+                video_count INTEGER,
+                uploads_playlist_id TEXT,
+                synced_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS channel_aliases (
+                channel_input TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS videos (
+                video_id TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                title TEXT,
+                description TEXT,
+                tags TEXT,
+                published_at TEXT,
+                view_count INTEGER,
+                like_count INTEGER,
+                stats_refreshed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos(channel_id, published_at);"""
+        )
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def resolve_alias(channel_input):
+    # Remembered input -> channel id, so handle lookups (100-unit searches) only happen once
+    with _lock:
+        row = _get_conn().execute(
+            "SELECT channel_id FROM channel_aliases WHERE channel_input = ?", (channel_input.strip(),)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def save_channel(channel, channel_input=None):
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            f"INSERT OR REPLACE INTO channels ({', '.join(CHANNEL_FIELDS)}, synced_at) "
+            f"VALUES ({', '.join('?' for _ in CHANNEL_FIELDS)}, ?)",
+            [channel[field] for field in CHANNEL_FIELDS] + [time.time()]
+        )
+        if channel_input:
+            conn.execute(
+                "INSERT OR REPLACE INTO channel_aliases (channel_input, channel_id) VALUES (?, ?)",
+                (channel_input.strip(), channel["channel_id"])
+            )
+        conn.commit()
+
+
+def get_channel(channel_id):
+    with _lock:
+        row = _get_conn().execute(
+            f"SELECT {', '.join(CHANNEL_FIELDS)}, synced_at FROM channels WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+    if row is None:
+        return None
+    channel = dict(zip(CHANNEL_FIELDS, row))
+    channel["synced_at"] = row[-1]
+    return channel
+
+
+def known_video_ids(channel_id):
+    with _lock:
+        rows = _get_conn().execute("SELECT video_id FROM videos WHERE channel_id = ?", (channel_id,)).fetchall()
+    return {row[0] for row in rows}
+
+
+def _video_rows(channel_id, videos, now):
+    # Accepts a typed video frame (read column-wise) or a list of video dicts
+    if is_video_frame(videos):
+        published = videos["published_at"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return [
+            (video_id, channel_id, title, description, json.dumps(list(tags)), published_at,
+             int(view_count), int(like_count), now)
+            for video_id, title, description, tags, published_at, view_count, like_count in zip(
+                videos["video_id"], videos["title"], videos["description"], videos["tags"], published,
+                videos["view_count"], videos["like_count"])
+        ]
+    return [(v["video_id"], channel_id, v["title"], v["description"], json.dumps(v["tags"]), v["published_at"],
+             v["view_count"], v["like_count"], now) for v in videos]
+
+
+def upsert_videos(channel_id, videos):
+    rows = _video_rows(channel_id, videos, time.time())
+    with _lock:
+        conn = _get_conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO videos (video_id, channel_id, title, description, tags, published_at, "
+            "view_count, like_count, stats_refreshed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+
+
+def delete_videos(video_ids):
+    if not video_ids:
+        return
+    with _lock:
+        conn = _get_conn()
+        conn.executemany("DELETE FROM videos WHERE video_id = ?", [(video_id,) for video_id in video_ids])
+        conn.commit()
+
+
+def refresh_candidates(channel_id, recent_days=14, recent_refresh_minutes=60, stale_after_hours=24 * 7):
+    # Recent uploads still gain views quickly, so they refresh often; older ones only once stale
+    now = time.time()
+    recent_cutoff = (datetime.now(timezone.utc) - timedelta(days=recent_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    with _lock:
+        rows = _get_conn().execute(
+            "SELECT video_id FROM videos WHERE channel_id = ? AND ("
+            "(published_at >= ? AND stats_refreshed_at < ?) OR stats_refreshed_at < ?) "
+            "ORDER BY published_at DESC",
+            (channel_id, recent_cutoff, now - recent_refresh_minutes * 60, now - stale_after_hours * 3600)
+        ).fetchall()
+    return [row[0] for row in rows]
+
+
+def load_videos(channel_id):
+    # Newest first, matching the uploads playlist order
+    with _lock:
+        rows = _get_conn().execute(
+            f"SELECT {', '.join(VIDEO_FIELDS)} FROM videos WHERE channel_id = ? ORDER BY published_at DESC",
+            (channel_id,)
+        ).fetchall()
+    videos = []
+    for row in rows:
+        video = dict(zip(VIDEO_FIELDS, row))
+        video["tags"] = json.loads(video["tags"]) if video["tags"] else []
+        videos.append(video)
+    return videos
+
+
+def load_video_frame(channel_id):
+    # Same rows as load_videos, streamed from the cursor straight into typed columns
+    builder = VideoFrameBuilder()
+    with _lock:
+        cursor = _get_conn().execute(
+            f"SELECT {', '.join(VIDEO_FIELDS)} FROM videos WHERE channel_id = ? ORDER BY published_at DESC",
+            (channel_id,)
+        )
+        builder.add_rows(
+            (video_id, title, description, json.loads(tags) if tags else [], published_at, view_count, like_count)
+            for video_id, title, description, tags, published_at, view_count, like_count in cursor
+        )
+    return builder.build()
@@ -0,0 +1,70 @@
+import os
+from dotenv import load_dotenv
+from modules import channel_store, tracing
+from modules.channel_tracker import (
+    get_channel_data,
+    get_channel_by_id,
+    crawl_channel_videos,
+    get_video_stats,
+    YOUTUBE_MAX_WORKERS
+)
+
+load_dotenv()
+
+# How often statistics are refreshed for already-known videos
+SYNC_RECENT_DAYS = int(os.getenv("SYNC_RECENT_DAYS", "14"))
+SYNC_RECENT_REFRESH_MINUTES = int(os.getenv("SYNC_RECENT_REFRESH_MINUTES", "60"))
+SYNC_STALE_AFTER_HOURS = int(os.getenv("SYNC_STALE_AFTER_HOURS", str(24 * 7)))
+
+
+@tracing.traced("channel.sync")
+def sync_channel(channel_input, progress_callback=None, as_frame=False, max_workers=YOUTUBE_MAX_WORKERS):
+    # Incremental sync: only new uploads are crawled, and only recent/stale videos get fresh statistics
+    span = tracing.current_span()
+    channel_id = channel_store.resolve_alias(channel_input)
+    channel = get_channel_by_id(channel_id) if channel_id else get_channel_data(channel_input)
+    channel_id = channel["channel_id"]
+    with span.phase("store"):
+        channel_store.save_channel(channel, channel_input)
+        known_ids = channel_store.known_video_ids(channel_id)
+    new_videos = crawl_channel_videos(
+        channel["uploads_playlist_id"],
+        progress_callback=progress_callback,
+        total_videos=max(channel["video_count"] - len(known_ids), 0),
+        stop_at_ids=known_ids,
+        as_frame=as_frame,
+        max_workers=max_workers
+    )
+    with span.phase("store"):
+        channel_store.upsert_videos(channel_id, new_videos)
+
+    refreshed = []
+    stale_ids = []
+    if known_ids:
+        stale_ids = channel_store.refresh_candidates(
+            channel_id,
+            recent_days=SYNC_RECENT_DAYS,
+            recent_refresh_minutes=SYNC_RECENT_REFRESH_MINUTES,
+            stale_after_hours=SYNC_STALE_AFTER_HOURS
+        )
+        if stale_ids:
+            # Raises on any failed videos call, aborting the sync before anything is deleted:
+            # only a complete set of 200 responses can prove a video is gone
+            refreshed = get_video_stats(stale_ids, max_workers=max_workers, as_frame=as_frame)
+            # Ids the API no longer returns were deleted or made private
+            returned = set(refreshed["video_id"]) if as_frame else {v["video_id"] for v in refreshed}
+            with span.phase("store"):
+                channel_store.upsert_videos(channel_id, refreshed)
+                channel_store.delete_videos([video_id for video_id in stale_ids if video_id not in returned])
+
+    summary = {
+        "full_crawl": not known_ids,
+        "new_videos": len(new_videos),
+        "refreshed_videos": len(refreshed),
+        "removed_videos": len(stale_ids) - len(refreshed)
+    }
+    with span.phase("load"):
+        videos = channel_store.load_video_frame(channel_id) if as_frame else channel_store.load_videos(channel_id)
+    span.set("videos", len(videos))
+    # The stored record carries synced_at, which callers can use as a cache version
+    return channel_store.get_channel(channel_id), videos, summary
@@ -1,24 +1,92 @@
 import os
+import json
+import threading
 import requests
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from groq import Groq
+from modules import tracing, youtube_http_cache, youtube_quota
+from modules.single_flight import coalesce
+from modules.video_frame import VideoFrameBuilder, to_video_frame
 import io
 
 load_dotenv()
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
+YOUTUBE_API_BASE = os.getenv("YOUTUBE_API_BASE", "https://www.googleapis.com/youtube/v3")
 
+# Connection pool / concurrency tuning for the YouTube Data API
+YOUTUBE_POOL_SIZE = int(os.getenv("YOUTUBE_POOL_SIZE", "16"))
+YOUTUBE_MAX_WORKERS = int(os.getenv("YOUTUBE_MAX_WORKERS", "8"))
+YOUTUBE_TIMEOUT = (float(os.getenv("YOUTUBE_CONNECT_TIMEOUT", "5")), float(os.getenv("YOUTUBE_READ_TIMEOUT", "30")))
+
+_youtube_session = None
+_youtube_session_lock = threading.Lock()
+
+def get_youtube_session():
+    global _youtube_session
+    if _youtube_session is None:
+        with _youtube_session_lock:
+            if _youtube_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=YOUTUBE_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Accept-Encoding": "gzip, deflate"})
+                _youtube_session = session
+    return _youtube_session
+
+def youtube_get(endpoint, params):
+    # Conditional GET: replay the cached body when the API answers 304 for our stored ETag
+    with tracing.span(f"youtube.{endpoint}", endpoint=endpoint) as span:
+        cache_key = youtube_http_cache.make_key(endpoint, params)
+        cached = youtube_http_cache.lookup(cache_key)
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+
+        params = dict(params, key=YOUTUBE_API_KEY)
+        with span.phase("request"):
+            res = youtube_quota.scheduler.execute(endpoint, lambda: get_youtube_session().get(
+                f"{YOUTUBE_API_BASE}/{endpoint}", params=params, headers=headers, timeout=YOUTUBE_TIMEOUT
+            ))
+            raw = res.content
+        # elapsed = last attempt's send until headers, including DNS/TCP/TLS on a new connection
+        span.add_phase("wait", res.elapsed.total_seconds())
+        span.set("status_code", res.status_code)
+        span.add("bytes_in", len(raw))
+
+        if res.status_code == 304 and cached:
+            span.add("cache_hits")
+            youtube_http_cache.touch(cache_key)
+            youtube_http_cache.record_response(endpoint, len(raw), not_modified=True,
+                                               cached_bytes=len(cached["body"].encode("utf-8")))
+            with span.phase("parse"):
+                return json.loads(cached["body"])
+
+        youtube_http_cache.record_response(endpoint, len(raw))
+        # The scheduler already raises on final errors; this also covers anything it lets through
+        # (e.g. a 304 without a cached body), so an error body is never parsed as an empty page
+        if not 200 <= res.status_code < 300:
+            raise youtube_quota.YouTubeApiError(
+                endpoint, res.status_code, f"❌ YouTube API {endpoint} request failed with HTTP {res.status_code}"
+            )
+        with span.phase("parse"):
+            data = res.json()
+        etag = res.headers.get("ETag") or data.get("etag")
+        if res.status_code == 200 and etag:
+            youtube_http_cache.store(cache_key, etag, res.text)
+        return data
+
+@tracing.traced("channel.get_channel_data")
+@coalesce(lambda channel_input: channel_input.strip())
 def get_channel_data(channel_input):
     try:
         if "@" in channel_input and "youtube.com" in channel_input:
             handle = channel_input.split("@")[-1].strip("/")
-            search_url = f"{YOUTUBE_API_BASE}/search?part=snippet&q={handle}&type=channel&key={YOUTUBE_API_KEY}"
-            search_res = requests.get(search_url).json()
+            search_res = youtube_get("search", {"part": "snippet", "q": handle, "type": "channel"})
             if "items" not in search_res or not search_res["items"]:
                 raise Exception("❌ Channel not found using handle search.")
             channel_id = search_res["items"][0]["snippet"]["channelId"]
@@ -26,8 +94,7 @@ def get_channel_data(channel_input):
             channel_id = channel_input.split("/channel/")[-1].split("/")[0]
         elif "youtube.com" not in channel_input:
             # Assume it's a plain username
-            search_url = f"{YOUTUBE_API_BASE}/channels?part=snippet,statistics,contentDetails&forUsername={channel_input}&key={YOUTUBE_API_KEY}"
-            res = requests.get(search_url).json()
+            res = youtube_get("channels", {"part": "snippet,statistics,contentDetails", "forUsername": channel_input})
             if "items" not in res or not res["items"]:
                 raise Exception("❌ Channel not found with username.")
             return parse_channel_data(res["items"][0])
@@ -35,17 +102,21 @@ def get_channel_data(channel_input):
             raise Exception("❌ Invalid YouTube channel input format.")
 
         # Get channel details from ID
-        url = f"{YOUTUBE_API_BASE}/channels?part=snippet,statistics,contentDetails&id={channel_id}&key={YOUTUBE_API_KEY}"
-        res = requests.get(url).json()
-        if "items" not in res or not res["items"]:
-            raise Exception("❌ Channel not found with resolved ID.")
-        return parse_channel_data(res["items"][0])
+        return get_channel_by_id(channel_id)
 
     except Exception as e:
         raise Exception(f"Failed to fetch channel data: {str(e)}")
 
+@coalesce(lambda channel_id: channel_id)
+def get_channel_by_id(channel_id):
+    res = youtube_get("channels", {"part": "snippet,statistics,contentDetails", "id": channel_id})
+    if "items" not in res or not res["items"]:
+        raise Exception("❌ Channel not found with resolved ID.")
+    return parse_channel_data(res["items"][0])
+
 def parse_channel_data(data):
     return {
+        "channel_id": data["id"],
         "channel_title": data["snippet"]["title"],
         "description": data["snippet"].get("description", ""),
         "published_at": data["snippet"]["publishedAt"],
@@ -55,92 +126,216 @@ def parse_channel_data(data):
         "uploads_playlist_id": data["contentDetails"]["relatedPlaylists"]["uploads"]
     }
 
-def get_videos_from_playlist(playlist_id, max_results=50):
-    videos = []
+def iter_playlist_pages(playlist_id, max_results=50, stop_at_ids=None):
+    # Yields one list of videos per playlistItems page.
+    # Uploads are newest first, so paging stops at the first id in stop_at_ids (already known).
     next_page_token = ""
     while True:
-        url = f"{YOUTUBE_API_BASE}/playlistItems?part=snippet&maxResults={max_results}&playlistId={playlist_id}&key={YOUTUBE_API_KEY}&pageToken={next_page_token}"
-        res = requests.get(url).json()
+        res = youtube_get("playlistItems", {
+            "part": "snippet",
+            "maxResults": max_results,
+            "playlistId": playlist_id,
+            "pageToken": next_page_token
+        })
+        page = []
+        reached_known = False
         for item in res.get("items", []):
             snippet = item["snippet"]
-            videos.append({
+            if stop_at_ids and snippet["resourceId"]["videoId"] in stop_at_ids:
+                reached_known = True
+                break
+            page.append({
                 "video_id": snippet["resourceId"]["videoId"],
                 "title": snippet["title"],
                 "description": snippet.get("description", ""),
                 "published_at": snippet["publishedAt"]
             })
+        yield page
         next_page_token = res.get("nextPageToken")
-        if not next_page_token:
+        if reached_known or not next_page_token:
             break
+
+def get_videos_from_playlist(playlist_id, max_results=50, stop_at_ids=None):
+    videos = []
+    for page in iter_playlist_pages(playlist_id, max_results, stop_at_ids):
+        videos.extend(page)
     return videos
 
-def get_video_stats(video_ids):
+def fetch_video_items(chunk):
+    res = youtube_get("videos", {"part": "statistics,snippet", "id": ",".join(chunk)})
+    return res.get("items", [])
+
+def parse_video_item(item):
+    # List-of-dicts twin of VideoFrameBuilder.add_items; keep the two in step
+    statistics = item.get("statistics", {})
+    return {
+        "video_id": item["id"],
+        "title": item["snippet"]["title"],
+        "description": item["snippet"].get("description", ""),
+        "tags": item["snippet"].get("tags", []),
+        "published_at": item["snippet"]["publishedAt"],
+        "view_count": int(statistics.get("viewCount", 0)),
+        "like_count": int(statistics.get("likeCount", 0))
+    }
+
+@tracing.traced("channel.get_video_stats")
+@coalesce(lambda video_ids, max_workers=None, as_frame=False: (tuple(video_ids), as_frame))
+def get_video_stats(video_ids, max_workers=YOUTUBE_MAX_WORKERS, as_frame=False):
+    chunks = [video_ids[i:i+50] for i in range(0, len(video_ids), 50)]
+    builder = VideoFrameBuilder()
     stats = []
-    for i in range(0, len(video_ids), 50):
-        chunk = video_ids[i:i+50]
-        url = f"{YOUTUBE_API_BASE}/videos?part=statistics,snippet&id={','.join(chunk)}&key={YOUTUBE_API_KEY}"
-        res = requests.get(url).json()
-        for item in res.get("items", []):
-            stats.append({
-                "video_id": item["id"],
-                "title": item["snippet"]["title"],
-                "description": item["snippet"].get("description", ""),
-                "tags": item["snippet"].get("tags", []),
-                "published_at": item["snippet"]["publishedAt"],
-                "view_count": int(item["statistics"].get("viewCount", 0)),
-                "like_count": int(item["statistics"].get("likeCount", 0))
-            })
-    return stats
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for items in executor.map(tracing.propagate(fetch_video_items), chunks):
+            if as_frame:
+                builder.add_items(items)
+            else:
+                stats.extend(parse_video_item(item) for item in items)
+    return builder.build() if as_frame else stats
+
+@tracing.traced("channel.crawl_channel_videos")
+def crawl_channel_videos(playlist_id, max_workers=YOUTUBE_MAX_WORKERS, progress_callback=None, total_videos=None,
+                         stop_at_ids=None, as_frame=False, sink=None):
+    # Pipelined crawl: each playlist page's ids go to the stats pool while the next page downloads.
+    # progress_callback runs on the calling thread, so it is safe to update UI from it.
+    # With as_frame=True the typed columnar table is filled directly from the parsed pages.
+    # With a sink (anything with write(frame)), each chunk is handed over in playlist order and not kept;
+    # the return value is then the number of videos written.
+    progress = {"pages": 0, "videos_listed": 0, "videos_fetched": 0, "total_videos": total_videos}
+    futures = []
+
+    def report():
+        if progress_callback:
+            progress["videos_fetched"] = sum(size for future, size in futures if future is None or future.done())
+            progress_callback(dict(progress))
+
+    builder = VideoFrameBuilder()
+    stats = []
+    written = 0
+    consumed = 0
+    fetch_items = tracing.propagate(fetch_video_items)
+
+    def consume(wait):
+        # Hands finished chunks over in playlist order; without wait, stops at the first unfinished one
+        nonlocal written, consumed
+        while consumed < len(futures) and (wait or futures[consumed][0].done()):
+            items = futures[consumed][0].result()
+            # Drop the future so finished chunks can be freed while streaming
+            futures[consumed] = (None, len(items))
+            consumed += 1
+            if sink is not None:
+                chunk_builder = VideoFrameBuilder()
+                chunk_builder.add_items(items)
+                sink.write(chunk_builder.build())
+                written += len(items)
+            elif as_frame:
+                builder.add_items(items)
+            else:
+                stats.extend(parse_video_item(item) for item in items)
+            if wait:
+                report()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for page in iter_playlist_pages(playlist_id, stop_at_ids=stop_at_ids):
+            ids = [v["video_id"] for v in page]
+            for i in range(0, len(ids), 50):
+                chunk = ids[i:i+50]
+                futures.append((executor.submit(fetch_items, chunk), len(chunk)))
+            progress["pages"] += 1
+            progress["videos_listed"] += len(ids)
+            # Drain while paging, so only chunks still in flight are held in memory
+            consume(wait=False)
+            report()
+        consume(wait=True)
+    span = tracing.current_span()
+    span.set("pages", progress["pages"])
+    span.set("videos", progress["videos_listed"])
+    if sink is not None:
+        return written
+    return builder.build() if as_frame else stats
 
 def export_to_csv(video_details, channel_title):
-    df = pd.DataFrame(video_details)
+    df = to_video_frame(video_details)
     csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
+    df.assign(tags=df["tags"].map(", ".join)).to_csv(csv_buffer, index=False)
     csv_buffer.seek(0)
     return csv_buffer
 
 def show_top_5_videos(video_details):
-    return sorted(video_details, key=lambda x: x["view_count"], reverse=True)[:5]
+    return to_video_frame(video_details).nlargest(5, "view_count")
 
 def upload_frequency_chart(video_details):
-    df = pd.DataFrame(video_details)
-    df['published_at'] = pd.to_datetime(df['published_at'])
-    freq = df['published_at'].dt.to_period("M").value_counts().sort_index()
+    published = to_video_frame(video_details)["published_at"].dt.tz_convert(None)
+    freq = published.dt.to_period("M").value_counts().sort_index()
     return freq
 
-def metadata_optimization(video_details):
-    repeated_titles = set()
-    seen = set()
-    for vid in video_details:
-        if vid["title"] in seen:
-            repeated_titles.add(vid["title"])
-        seen.add(vid["title"])
-
-    missing_descriptions = sum(1 for v in video_details if not v["description"].strip())
-    missing_tags = sum(1 for v in video_details if not v["tags"])
-    hashtags = []
-    for v in video_details:
-        hashtags += [word for word in v["description"].split() if word.startswith("#")]
-    most_common = Counter(hashtags).most_common(5)
+def hashtag_occurrences(descriptions):
+    # Every whitespace-separated word starting with "#", plus the row position it came from.
+    # Uses Arrow compute kernels when pyarrow is installed, otherwise a single Python pass.
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        hashtags, rows = [], []
+        for i, text in enumerate(descriptions.tolist()):
+            if "#" in text:
+                for word in text.split():
+                    if word.startswith("#"):
+                        hashtags.append(word)
+                        rows.append(i)
+        return pd.Series(hashtags, dtype=object), np.asarray(rows, dtype=np.int64)
 
-    return {
-        "repeated_titles": list(repeated_titles),
-        "missing_descriptions": missing_descriptions,
-        "missing_tags": missing_tags,
+    words = pc.utf8_split_whitespace(pa.array(descriptions, type=pa.large_string(), from_pandas=True))
+    flat = pc.list_flatten(words)
+    mask = pc.starts_with(flat, "#")
+    hashtags = pc.filter(flat, mask).to_numpy(zero_copy_only=False)
+    rows = pc.filter(pc.list_parent_indices(words), mask).to_numpy()
+    return pd.Series(hashtags, dtype=object), rows.astype(np.int64)
+
+@tracing.traced("channel.metadata_optimization")
+def metadata_optimization(video_details, top_n=5, period=None):
+    # Vectorized over the video frame; period ("M", "Q", "Y", ...) adds a per-period breakdown
+    df = to_video_frame(video_details)
+    titles = df["title"]
+    repeated_titles = titles[titles.duplicated()].unique().tolist()
+    missing_description = df["description"].str.strip().eq("")
+    missing_tags = df["tags"].str.len().fillna(0).eq(0)
+
+    hashtags, hashtag_rows = hashtag_occurrences(df["description"])
+    hashtag_counts = hashtags.value_counts()
+    most_common = [(tag, int(count)) for tag, count in hashtag_counts.head(top_n).items()]
+
+    result = {
+        "repeated_titles": repeated_titles,
+        "missing_descriptions": int(missing_description.sum()),
+        "missing_tags": int(missing_tags.sum()),
         "common_hashtags": most_common
     }
 
-def analyze_channel_with_llm(video_samples):
+    if period:
+        periods = df["published_at"].dt.tz_convert(None).dt.to_period(period)
+        by_period = pd.DataFrame({
+            "videos": periods.value_counts(),
+            "missing_descriptions": missing_description.groupby(periods).sum(),
+            "missing_tags": missing_tags.groupby(periods).sum(),
+            "repeated_titles": titles.duplicated(keep=False).groupby(periods).sum()
+        }).fillna(0).astype("int64").sort_index()
+        top_hashtag = pd.Series(dtype=object)
+        if not hashtags.empty:
+            # Group on integer period codes; grouping on Period objects is several times slower
+            codes, uniques = pd.factorize(periods)
+            counts = pd.DataFrame({"period": codes[hashtag_rows], "hashtag": hashtags.to_numpy()}) \
+                .groupby(["period", "hashtag"]).size()
+            winners = counts.groupby(level=0).idxmax()
+            top_hashtag = pd.Series([key[1] for key in winners], index=uniques[winners.index.to_numpy()])
+        by_period["top_hashtag"] = top_hashtag.reindex(by_period.index).fillna("")
+        result["by_period"] = by_period
+
+    return result
+
+def analyze_channel_with_llm(video_details, force_fresh=False, progress_callback=None):
+    # Whole-channel feedback via map-reduce over every video (see modules/channel_analysis.py)
     if not GROQ_API_KEY:
         return "🔐 Groq API Key not found."
-    client = Groq(api_key=GROQ_API_KEY)
-    prompt = (
-        "You are a YouTube SEO expert. Analyze the following video titles and descriptions and provide suggestions to improve SEO, use of keywords, hashtags, and engagement:\n\n"
-    )
-    for i, video in enumerate(video_samples, 1):
-        prompt += f"{i}. Title: {video['title']}\n   Description: {video['description'][:300]}\n\n"
-    response = client.chat.completions.create(
-        model="llama3-70b-8192",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.choices[0].message.content.strip()
+    from modules.channel_analysis import analyze_channel
+
+    return analyze_channel(video_details, force_fresh=force_fresh, progress_callback=progress_callback)
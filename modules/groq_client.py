@@ -0,0 +1,260 @@
+import os
+import json
+import time
+import threading
+import itertools
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from modules import llm_cache, llm_resilience, single_flight, tracing
+from modules.llm_resilience import CircuitOpenError, DeadlineExceededError
+
+# Load environment variables
+load_dotenv()
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Groq API details
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+MODEL = "llama3-70b-8192"
+
+# Connection pool / timeout tuning (seconds)
+GROQ_POOL_SIZE = int(os.getenv("GROQ_POOL_SIZE", "10"))
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "120"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    # One keep-alive session per process so warm calls reuse the TCP+TLS connection
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=GROQ_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Authorization": f"Bearer {GROQ_API_KEY}",
+                    "Content-Type": "application/json",
+                    "Accept-Encoding": "gzip, deflate",
+                    "Connection": "keep-alive"
+                })
+                _session = session
+    return _session
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def post_chat_completion(payload, stream=False, span=tracing.NOOP_SPAN, read_timeout=GROQ_READ_TIMEOUT):
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY not found in environment variables.")
+    # Serialized once here so the request size can be traced without a second json.dumps
+    body = json.dumps(payload).encode("utf-8")
+    span.add("bytes_out", len(body))
+    response = get_session().post(
+        GROQ_API_URL,
+        data=body,
+        stream=stream,
+        timeout=(GROQ_CONNECT_TIMEOUT, read_timeout)
+    )
+    # elapsed = send until response headers (includes DNS/TCP/TLS when a new connection was opened)
+    span.add_phase("wait", response.elapsed.total_seconds())
+    span.set("status_code", response.status_code)
+    return response
+
+
+def _attempt_read_timeout():
+    # An abandoned attempt (lost hedge, missed deadline) must not hold a socket longer than the deadline
+    return min(GROQ_READ_TIMEOUT, llm_resilience.caller.deadline)
+
+
+def _send_chat(payload, span):
+    response = post_chat_completion(payload, span=span, read_timeout=_attempt_read_timeout())
+    span.add("bytes_in", len(response.content))
+    return response
+
+
+def _open_stream(payload, span):
+    # Reads up to the first content chunk, so hedging and the deadline cover time-to-first-token
+    response = post_chat_completion(payload, stream=True, span=span, read_timeout=_attempt_read_timeout())
+    if response.status_code != 200:
+        return response, iter(()), []
+    lines = response.iter_lines(decode_unicode=True)
+    prefetched = []
+    for line in lines:
+        prefetched.append(line)
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]" or (json.loads(data).get("choices") or [{}])[0].get("delta", {}).get("content"):
+            break
+    return response, lines, prefetched
+
+
+def _close_stream(result):
+    result[0].close()
+
+
+def _serve_stale(cache_key, span, force_fresh):
+    # Expired entries are still better than an error while Groq is failing, unless the caller
+    # explicitly skipped the cache: force_fresh callers (refresh buttons, batch reruns) get the error
+    if force_fresh or not llm_resilience.LLM_SERVE_STALE:
+        return None
+    cached = llm_cache.lookup_stale(cache_key)
+    if cached is not None:
+        span.set("stale", True)
+    return cached
+
+
+def _record_usage(span, usage):
+    for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        if usage and usage.get(field) is not None:
+            span.add(field, usage[field])
+
+
+def chat_completion(messages, temperature=0.8, model=MODEL, force_fresh=False):
+    # Identical concurrent requests (e.g. two sessions generating for the same idea) share one API call
+    cache_key = llm_cache.make_key(model, messages, temperature)
+    return single_flight.group.do(("chat", cache_key, force_fresh), _chat_completion,
+                                  messages, temperature, model, force_fresh, cache_key)
+
+
+def _chat_completion(messages, temperature, model, force_fresh, cache_key):
+    with tracing.span("groq.chat_completion", model=model, temperature=temperature) as span:
+        if not force_fresh:
+            with span.phase("cache"):
+                cached = llm_cache.lookup(cache_key)
+            if cached is not None:
+                span.add("cache_hits")
+                return cached
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature
+        }
+
+        try:
+            with span.phase("request"):
+                response = llm_resilience.caller.execute("chat", lambda attempt_span: _send_chat(payload, attempt_span))
+        except (CircuitOpenError, DeadlineExceededError, requests.RequestException):
+            stale = _serve_stale(cache_key, span, force_fresh)
+            if stale is None:
+                raise
+            return stale
+
+        if response.status_code == 200:
+            with span.phase("parse"):
+                data = response.json()
+            _record_usage(span, data.get("usage"))
+            content = data["choices"][0]["message"]["content"]
+            llm_cache.store(cache_key, content)
+            return content
+        else:
+            stale = None
+            if response.status_code in llm_resilience.UNHEALTHY_STATUS:
+                stale = _serve_stale(cache_key, span, force_fresh)
+            if stale is not None:
+                return stale
+            raise Exception(f"Error {response.status_code}: {response.text}")
+
+
+def stream_chat_completion(messages, temperature=0.8, model=MODEL, force_fresh=False):
+    # Yields text chunks as they arrive over server-sent events.
+    # Concurrent identical streams share one upstream response; late joiners replay what they missed.
+    cache_key = llm_cache.make_key(model, messages, temperature)
+    yield from single_flight.group.stream(
+        ("stream", cache_key, force_fresh),
+        lambda: _stream_chat_completion(messages, temperature, model, force_fresh, cache_key)
+    )
+
+
+def _stream_chat_completion(messages, temperature, model, force_fresh, cache_key):
+    span = tracing.start_span("groq.stream_chat_completion", model=model, temperature=temperature)
+    if not force_fresh:
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            span.add("cache_hits")
+            span.finish()
+            yield cached
+            return
+
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "stream": True
+    }
+
+    error = None
+    response = None
+    try:
+        started = time.perf_counter()
+        try:
+            with tracing.activate(span):
+                response, lines, prefetched = llm_resilience.caller.execute(
+                    "stream", lambda attempt_span: _open_stream(payload, attempt_span), discard=_close_stream
+                )
+        except (CircuitOpenError, DeadlineExceededError, requests.RequestException):
+            stale = _serve_stale(cache_key, span, force_fresh)
+            if stale is None:
+                raise
+            yield stale
+            return
+        if response.status_code != 200:
+            stale = None
+            if response.status_code in llm_resilience.UNHEALTHY_STATUS:
+                stale = _serve_stale(cache_key, span, force_fresh)
+            if stale is not None:
+                yield stale
+                return
+            raise Exception(f"Error {response.status_code}: {response.text}")
+
+        parts = []
+        # A stream cut off mid-answer (dropped connection) ends without [DONE] or a finish_reason
+        complete = False
+        for line in itertools.chain(prefetched, lines):
+            if not line or not line.startswith("data:"):
+                continue
+            span.add("bytes_in", len(line))
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                complete = True
+                break
+            event = json.loads(data)
+            # Groq reports token usage on the final event under x_groq
+            _record_usage(span, (event.get("x_groq") or {}).get("usage") or event.get("usage"))
+            choices = event.get("choices") or [{}]
+            if choices[0].get("finish_reason"):
+                complete = True
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                if not parts:
+                    span.add_phase("first_chunk", time.perf_counter() - started)
+                parts.append(delta)
+                yield delta
+        span.add_phase("stream", time.perf_counter() - started)
+
+        # Only complete answers are cached; a truncated one would be replayed for the whole TTL.
+        # Raising also keeps it out of the semantic cache, which stores whatever a stream yielded.
+        if not complete:
+            span.set("truncated", True)
+            raise Exception("⚠️ Groq stream ended before the answer was complete. Please try again.")
+        llm_cache.store(cache_key, "".join(parts))
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        if response is not None:
+            response.close()
+        # GeneratorExit means the consumer stopped early, not that the call failed
+        span.finish(None if isinstance(error, GeneratorExit) else error)
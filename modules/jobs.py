@@ -0,0 +1,195 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from modules import tracing
+
+load_dotenv()
+
+# Long-running work (channel crawls + LLM analyses) runs here instead of in a Streamlit script thread,
+# so a rerun or a closed tab does not cancel it and several users' analyses run side by side
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Finished jobs stay pollable this long (seconds) before they are forgotten
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", "3600"))
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class Job:
+    def __init__(self, name, key=None):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.key = key
+        self.status = "queued"
+        self.phase = None
+        self.progress = 0.0
+        self.message = ""
+        self.phases = []
+        self.partial = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.lock = threading.Lock()
+
+    def update(self, phase=None, progress=None, message=None, **partial):
+        # Called by the job function: current phase, progress within it (0-1), a status line,
+        # and any intermediate results the page can already show
+        with self.lock:
+            if phase is not None and phase != self.phase:
+                now = time.time()
+                if self.phases:
+                    self.phases[-1]["seconds"] = round(now - self.phases[-1]["started_at"], 3)
+                self.phases.append({"phase": phase, "started_at": now, "seconds": None})
+                self.phase = phase
+                self.progress = 0.0
+            if progress is not None:
+                self.progress = min(max(float(progress), 0.0), 1.0)
+            if message is not None:
+                self.message = message
+            self.partial.update(partial)
+
+    def snapshot(self):
+        with self.lock:
+            end = self.finished_at or time.time()
+            return {
+                "id": self.id,
+                "name": self.name,
+                "key": self.key,
+                "status": self.status,
+                "phase": self.phase,
+                "progress": self.progress,
+                "message": self.message,
+                "phases": [dict(p) for p in self.phases],
+                "partial": dict(self.partial),
+                "result": self.result,
+                "error": self.error,
+                "elapsed_seconds": round(end - (self.started_at or end), 2),
+                "queued_seconds": round((self.started_at or end) - self.created_at, 2)
+            }
+
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, retention=JOB_RETENTION):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self.workers = workers
+        self.retention = retention
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, name, fn, *args, key=None, reuse_finished=0, **kwargs):
+        # fn(job, *args, **kwargs) runs on a worker. A queued or running job with the same key is
+        # reused, so two sessions analyzing the same channel share one job; with reuse_finished,
+        # so is a job that finished successfully within that many seconds (its result acts as the cache).
+        with self.lock:
+            self._prune()
+            if key is not None:
+                cutoff = time.time() - reuse_finished
+                for job in sorted(self.jobs.values(), key=lambda j: j.created_at, reverse=True):
+                    if job.key != key:
+                        continue
+                    if job.status in ACTIVE_STATUSES or (job.status == "done" and job.finished_at >= cutoff):
+                        return job.id
+            job = Job(name, key)
+            self.jobs[job.id] = job
+            job.future = self.executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        with job.lock:
+            if job.status == "cancelled":
+                return
+            job.status = "running"
+            job.started_at = time.time()
+        try:
+            with tracing.span(f"job.{job.name}"):
+                result = fn(job, *args, **kwargs)
+        except Exception as e:
+            with job.lock:
+                job.status = "error"
+                job.error = str(e)
+        else:
+            with job.lock:
+                job.status = "done"
+                job.result = result
+                job.progress = 1.0
+        finally:
+            with job.lock:
+                job.finished_at = time.time()
+                if job.phases and job.phases[-1]["seconds"] is None:
+                    job.phases[-1]["seconds"] = round(job.finished_at - job.phases[-1]["started_at"], 3)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self.jobs.items()
+                       if job.finished_at is not None and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def status(self, job_id):
+        job = self.get(job_id)
+        return job.snapshot() if job else None
+
+    def result(self, job_id, timeout=None):
+        # Blocks until the job finishes; raises its error like a direct call would
+        job = self.get(job_id)
+        if job is None:
+            raise Exception(f"Unknown or expired job: {job_id}")
+        job.future.result(timeout=timeout)
+        if job.status == "error":
+            raise Exception(job.error)
+        if job.status == "cancelled":
+            raise Exception(f"Job {job_id} was cancelled")
+        return job.result
+
+    def cancel(self, job_id):
+        # Only queued jobs can be cancelled; a running crawl finishes and its result is still cached
+        job = self.get(job_id)
+        if job is None:
+            return False
+        with job.lock:
+            if job.status != "queued":
+                return False
+            job.status = "cancelled"
+            job.finished_at = time.time()
+        job.future.cancel()
+        return True
+
+    def stats(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        counts = {"queued": 0, "running": 0, "done": 0, "error": 0, "cancelled": 0}
+        for job in jobs:
+            counts[job.status] += 1
+        counts["workers"] = self.workers
+        return counts
+
+
+queue = JobQueue()
+
+
+def submit_job(name, fn, *args, key=None, reuse_finished=0, **kwargs):
+    return queue.submit(name, fn, *args, key=key, reuse_finished=reuse_finished, **kwargs)
+
+
+def job_status(job_id):
+    return queue.status(job_id)
+
+
+def job_result(job_id, timeout=None):
+    return queue.result(job_id, timeout=timeout)
+
+
+def cancel_job(job_id):
+    return queue.cancel(job_id)
+
+
+def job_stats():
+    return queue.stats()
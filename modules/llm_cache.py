@@ -0,0 +1,124 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# On-disk cache settings
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+# Expired rows are kept this much longer (seconds) so they can still be served while Groq is down
+LLM_CACHE_STALE_GRACE = float(os.getenv("LLM_CACHE_STALE_GRACE", str(30 * 24 * 3600)))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+_conn = None
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "stale_hits": 0}
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(LLM_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(LLM_CACHE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS generations (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_generations_access ON generations(last_access)")
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def make_key(model, messages, temperature):
+    # Content address: the same model + prompt + temperature always maps to the same key
+    raw = json.dumps({"model": model, "messages": messages, "temperature": temperature},
+                     sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def lookup(key, ttl=None):
+    if not LLM_CACHE_ENABLED:
+        return None
+    ttl = LLM_CACHE_TTL if ttl is None else ttl
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        row = conn.execute("SELECT value, created_at FROM generations WHERE key = ?", (key,)).fetchone()
+        if row is None or (ttl and now - row[1] > ttl):
+            _stats["misses"] += 1
+            return None
+        conn.execute("UPDATE generations SET last_access = ? WHERE key = ?", (now, key))
+        conn.commit()
+        _stats["hits"] += 1
+        return row[0]
+
+
+def lookup_stale(key):
+    # Any stored value regardless of TTL, for outages; not counted as a regular hit or miss
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _lock:
+        row = _get_conn().execute("SELECT value FROM generations WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            _stats["stale_hits"] += 1
+    return row[0] if row else None
+
+
+def store(key, value):
+    if not LLM_CACHE_ENABLED:
+        return
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO generations (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+            (key, value, now, now)
+        )
+        _stats["stores"] += 1
+        _evict(conn, now)
+        conn.commit()
+
+
+def _evict(conn, now):
+    # Drop rows past the TTL and the stale grace period first, then the least recently used ones above the size cap
+    evicted = 0
+    if LLM_CACHE_TTL:
+        evicted += conn.execute("DELETE FROM generations WHERE created_at < ?",
+                                (now - LLM_CACHE_TTL - LLM_CACHE_STALE_GRACE,)).rowcount
+    count = conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+    if count > LLM_CACHE_MAX_ENTRIES:
+        evicted += conn.execute(
+            "DELETE FROM generations WHERE key IN "
+            "(SELECT key FROM generations ORDER BY last_access ASC LIMIT ?)",
+            (count - LLM_CACHE_MAX_ENTRIES,)
+        ).rowcount
+    _stats["evictions"] += evicted
+
+
+def clear():
+    with _lock:
+        conn = _get_conn()
+        conn.execute("DELETE FROM generations")
+        conn.commit()
+
+
+def cache_stats():
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
@@ -0,0 +1,237 @@
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+from modules import tracing
+
+load_dotenv()
+
+# Total time a caller waits for an LLM answer (for streams: for the first chunk), hedges included
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "60"))
+# A duplicate request is sent once the first one is slower than the observed percentile
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_DISABLED", "").lower() not in ("1", "true", "yes")
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+# Consecutive failed calls that open the circuit, and how long it stays open before one probe is let through
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+# While the circuit is open or a call fails, answer from the generation cache even if the entry has expired
+LLM_SERVE_STALE = os.getenv("LLM_SERVE_STALE", "1").lower() in ("1", "true", "yes")
+
+UNHEALTHY_STATUS = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class DeadlineExceededError(Exception):
+    pass
+
+
+class LatencyTracker:
+    # Sliding window of successful call latencies (seconds) per kind ("chat", "stream")
+    def __init__(self, window=LLM_LATENCY_WINDOW):
+        self.window = window
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, kind, seconds):
+        with self.lock:
+            self.samples.setdefault(kind, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, kind, q):
+        with self.lock:
+            values = sorted(self.samples.get(kind, ()))
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def count(self, kind):
+        with self.lock:
+            return len(self.samples.get(kind, ()))
+
+    def percentiles(self):
+        with self.lock:
+            kinds = list(self.samples)
+        return {
+            kind: {
+                "samples": self.count(kind),
+                **{f"p{int(q * 100)}_ms": round(self.percentile(kind, q) * 1000, 1) for q in (0.5, 0.9, 0.95, 0.99)}
+            }
+            for kind in kinds
+        }
+
+
+class CircuitBreaker:
+    # closed -> open after N consecutive failures -> half_open after the cooldown (one probe) -> closed or open
+    def __init__(self, failure_threshold=LLM_BREAKER_FAILURES, cooldown=LLM_BREAKER_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def retry_in(self):
+        with self.lock:
+            if self.state != "open":
+                return 0.0
+            return max(self.cooldown - (time.monotonic() - self.opened_at), 0.0)
+
+
+class ResilientCaller:
+    # Runs one logical LLM call as up to two racing attempts under a deadline, behind a circuit breaker.
+    # attempt(span) performs one HTTP request and returns its response (or a tuple starting with it);
+    # the first healthy result wins and discard() is called on any late loser.
+    def __init__(self, deadline=LLM_DEADLINE, max_workers=16):
+        self.deadline = deadline
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-attempt")
+        self.stats = {"calls": 0, "hedges": 0, "hedge_wins": 0, "deadline_exceeded": 0}
+        self.lock = threading.Lock()
+
+    def hedge_delay(self, kind):
+        if not LLM_HEDGE_ENABLED or self.latency.count(kind) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return max(self.latency.percentile(kind, LLM_HEDGE_PERCENTILE), LLM_HEDGE_MIN_DELAY)
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def _release(self, future, discard):
+        if discard is not None and future.exception() is None:
+            discard(future.result()[0])
+
+    def _attempt(self, attempt, index):
+        with tracing.span("groq.attempt", hedge=index > 0) as span:
+            started = time.perf_counter()
+            result = attempt(span)
+            return result, time.perf_counter() - started
+
+    def execute(self, kind, attempt, discard=None, deadline=None):
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"🚧 Groq looks unhealthy; skipping calls for another {self.breaker.retry_in():.0f}s."
+            )
+        deadline = self.deadline if deadline is None else deadline
+        span = tracing.current_span()
+        self._count("calls")
+        started = time.monotonic()
+        hedge_delay = self.hedge_delay(kind)
+        pending = {self.executor.submit(tracing.propagate(self._attempt), attempt, 0): 0}
+        last_result, last_error = None, None
+
+        while pending:
+            elapsed = time.monotonic() - started
+            timeout = deadline - elapsed
+            if hedge_delay is not None:
+                timeout = min(timeout, max(hedge_delay - elapsed, 0))
+            done, _ = wait(pending, timeout=max(timeout, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    result, seconds = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                response = result[0] if isinstance(result, tuple) else result
+                if last_result is not None and discard is not None:
+                    discard(last_result)
+                if response.status_code in UNHEALTHY_STATUS:
+                    last_result = result
+                    continue
+                # Winner: late attempts are released as they finish
+                for loser in pending:
+                    loser.add_done_callback(lambda f: self._release(f, discard))
+                self.latency.record(kind, seconds)
+                self.breaker.record_success()
+                if index > 0:
+                    self._count("hedge_wins")
+                    span.set("hedge_won", True)
+                return result
+
+            elapsed = time.monotonic() - started
+            if elapsed >= deadline:
+                break
+            if hedge_delay is not None and elapsed >= hedge_delay and pending:
+                # Only one duplicate per call; hedging stops once it has been sent
+                hedge_delay = None
+                self._count("hedges")
+                span.add("hedges")
+                pending[self.executor.submit(tracing.propagate(self._attempt), attempt, 1)] = 1
+
+        self.breaker.record_failure()
+        if pending:
+            for loser in pending:
+                loser.add_done_callback(lambda f: self._release(f, discard))
+            if last_result is not None and discard is not None:
+                discard(last_result)
+            self._count("deadline_exceeded")
+            span.set("deadline_exceeded", True)
+            raise DeadlineExceededError(f"⏱️ Groq did not respond within {deadline:g}s.")
+        if last_result is not None:
+            # The caller turns the unhealthy response into its usual error message
+            return last_result
+        raise last_error
+
+    def status(self):
+        with self.lock:
+            stats = dict(self.stats)
+        stats.update({
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "circuit_trips": self.breaker.trips,
+            "rejected": self.breaker.rejected,
+            "retry_in_s": round(self.breaker.retry_in(), 1),
+            "hedge_delay_ms": {
+                kind: round(self.hedge_delay(kind) * 1000, 1) if self.hedge_delay(kind) is not None else None
+                for kind in ("chat", "stream")
+            },
+            "latency": self.latency.percentiles()
+        })
+        return stats
+
+
+caller = ResilientCaller()
+
+
+def resilience_status():
+    return caller.status()
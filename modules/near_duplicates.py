@@ -0,0 +1,114 @@
+import re
+import zlib
+import numpy as np
+from modules import tracing
+from modules.video_frame import to_video_frame
+
+MINHASH_PERMUTATIONS = 128
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_text(text):
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def shingles(text, kind="char", k=5):
+    # Character k-grams suit short titles; word k-grams suit long descriptions
+    text = normalize_text(text)
+    if not text:
+        return set()
+    if kind == "word":
+        words = text.split()
+        if len(words) <= k:
+            return {" ".join(words)}
+        return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def choose_bands(threshold, num_perm=MINHASH_PERMUTATIONS):
+    # Pick bands x rows so the LSH S-curve crosses 50% candidate probability near the threshold
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    def __init__(self, num_perm=MINHASH_PERMUTATIONS, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        if not shingle_set:
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set), dtype=np.uint64,
+                             count=len(shingle_set))
+        # Universal hashing (a*x + b) mod p, one row per permutation, min over shingles
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+
+def find_near_duplicates(texts, threshold=0.8, num_perm=MINHASH_PERMUTATIONS, kind="char", k=5, seed=1):
+    # Clusters of indices whose estimated Jaccard similarity is >= threshold, in roughly linear time:
+    # each band bucket is verified against its first member instead of comparing every pair.
+    hasher = MinHasher(num_perm, seed)
+    signatures = {}
+    for i, text in enumerate(texts):
+        signature = hasher.signature(shingles(text or "", kind, k))
+        if signature is not None:
+            signatures[i] = signature
+    if len(signatures) < 2:
+        return []
+
+    bands, rows = choose_bands(threshold, num_perm)
+    parent = {i: i for i in signatures}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets = {}
+        for i, signature in signatures.items():
+            buckets.setdefault(signature[band * rows:(band + 1) * rows].tobytes(), []).append(i)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            head = members[0]
+            for other in members[1:]:
+                if find(head) == find(other):
+                    continue
+                similarity = float(np.mean(signatures[head] == signatures[other]))
+                if similarity >= threshold:
+                    parent[find(other)] = find(head)
+
+    clusters = {}
+    for i in signatures:
+        clusters.setdefault(find(i), []).append(i)
+    return sorted((sorted(members) for members in clusters.values() if len(members) > 1), key=len, reverse=True)
+
+
+@tracing.traced("channel.find_near_duplicates")
+def find_near_duplicate_videos(video_details, threshold=0.8):
+    # Near-identical titles (character shingles) and descriptions (word shingles) across a channel
+    df = to_video_frame(video_details)
+    titles = df["title"].tolist()
+    video_ids = df["video_id"].tolist()
+
+    def describe(clusters):
+        return [[{"video_id": video_ids[i], "title": titles[i]} for i in cluster] for cluster in clusters]
+
+    return {
+        "titles": describe(find_near_duplicates(titles, threshold, kind="char", k=5)),
+        "descriptions": describe(find_near_duplicates(df["description"].tolist(), threshold, kind="word", k=3))
+    }
@@ -0,0 +1,112 @@
+import os
+import re
+from collections import Counter
+from dotenv import load_dotenv
+from modules.near_duplicates import find_near_duplicates
+
+load_dotenv()
+
+# A line counts as boilerplate when it appears in at least this share of a channel's descriptions
+BOILERPLATE_MIN_SHARE = float(os.getenv("BOILERPLATE_MIN_SHARE", "0.5"))
+BOILERPLATE_MIN_DOCS = int(os.getenv("BOILERPLATE_MIN_DOCS", "3"))
+# Shared prefixes/suffixes shorter than this are left alone (they are usually just words)
+BOILERPLATE_MIN_AFFIX_CHARS = int(os.getenv("BOILERPLATE_MIN_AFFIX_CHARS", "20"))
+
+_SPACES = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+
+def _normalize_line(line):
+    return _SPACES.sub(" ", line).strip().lower()
+
+
+def compact_whitespace(text):
+    return _BLANK_LINES.sub("\n", "\n".join(_SPACES.sub(" ", line).strip() for line in text.splitlines())).strip()
+
+
+def _common_prefix(texts):
+    prefix = os.path.commonprefix(texts)
+    if prefix and not prefix[-1].isspace() and any(len(text) > len(prefix) for text in texts):
+        # Cut back to a word boundary so a half-shared word is not removed
+        prefix = prefix[:prefix.rfind(" ") + 1]
+    return prefix
+
+
+def _common_suffix(texts):
+    return _common_prefix([text[::-1] for text in texts])[::-1]
+
+
+def find_boilerplate_lines(descriptions, min_share=BOILERPLATE_MIN_SHARE, min_docs=BOILERPLATE_MIN_DOCS):
+    # Normalized lines that occur in many descriptions (socials, sponsor blurbs, gear links, ...)
+    documents = [text for text in descriptions if text]
+    if len(documents) < min_docs:
+        return set()
+    counts = Counter()
+    for text in documents:
+        counts.update({_normalize_line(line) for line in text.splitlines()} - {""})
+    threshold = max(min_docs, min_share * len(documents))
+    return {line for line, count in counts.items() if count >= threshold}
+
+
+def strip_boilerplate(descriptions, min_share=BOILERPLATE_MIN_SHARE, min_docs=BOILERPLATE_MIN_DOCS,
+                      min_affix_chars=BOILERPLATE_MIN_AFFIX_CHARS):
+    # Returns (cleaned descriptions, report). The report keeps one copy of what was removed,
+    # so a prompt can still mention the shared footer once instead of once per video.
+    boilerplate = find_boilerplate_lines(descriptions, min_share, min_docs)
+    cleaned = []
+    removed_lines = []
+    seen_removed = set()
+    for text in descriptions:
+        kept = []
+        for line in (text or "").splitlines():
+            key = _normalize_line(line)
+            if key in boilerplate:
+                if key not in seen_removed:
+                    seen_removed.add(key)
+                    removed_lines.append(line.strip())
+                continue
+            kept.append(line)
+        cleaned.append(compact_whitespace("\n".join(kept)))
+
+    # Shared intro/outro text inside a line (e.g. "In this video I ..." on every upload)
+    documents = [text for text in cleaned if text]
+    prefix = suffix = ""
+    if len(documents) >= min_docs:
+        prefix = _common_prefix(documents)
+        prefix = prefix if len(prefix) >= min_affix_chars else ""
+        suffix = _common_suffix([text[len(prefix):] for text in documents])
+        suffix = suffix if len(suffix) >= min_affix_chars else ""
+        if prefix or suffix:
+            cleaned = [text[len(prefix):len(text) - len(suffix)].strip() if text else text for text in cleaned]
+
+    report = {
+        "boilerplate_lines": removed_lines,
+        "prefix": prefix.strip(),
+        "suffix": suffix.strip(),
+        "chars_before": sum(len(text or "") for text in descriptions),
+        "chars_after": sum(len(text) for text in cleaned)
+    }
+    return cleaned, report
+
+
+def dedupe_texts(texts, near_duplicate_threshold=None):
+    # Index of the first text each entry repeats (None for originals). Exact matches are
+    # compared after normalization; near-duplicates use MinHash when a threshold is given.
+    first_seen = {}
+    duplicate_of = [None] * len(texts)
+    for i, text in enumerate(texts):
+        key = _normalize_line(text or "")
+        if not key:
+            continue
+        if key in first_seen:
+            duplicate_of[i] = first_seen[key]
+        else:
+            first_seen[key] = i
+    if near_duplicate_threshold:
+        candidates = [i for i, original in enumerate(duplicate_of) if original is None and texts[i]]
+        clusters = find_near_duplicates([texts[i] for i in candidates], near_duplicate_threshold, kind="word", k=3)
+        for cluster in clusters:
+            head = candidates[cluster[0]]
+            for member in cluster[1:]:
+                duplicate_of[candidates[member]] = head
+    return duplicate_of
@@ -0,0 +1,68 @@
+from modules import tracing
+from modules.groq_client import chat_completion, stream_chat_completion
+
+# Feedback rounds remembered (as one short line each) so earlier requests are not undone
+REFINEMENT_FEEDBACK_KEPT = 5
+
+
+class RefinementSession:
+    # One generation plus its follow-up edits. The first round sends the full prompt; each refinement
+    # sends only a one-line task summary, the latest output and the new feedback, so the prompt does
+    # not grow with the number of rounds and the template is not resent.
+    def __init__(self, messages, task, kind, temperature=0.8, parse=None):
+        self.messages = messages
+        self.system = messages[0]["content"]
+        self.task = task
+        self.kind = kind
+        self.temperature = temperature
+        self.parse = parse or str.strip
+        self.feedback = []
+        self.last_output = None
+
+    def refine_messages(self, feedback):
+        applied = ""
+        if self.feedback:
+            kept = self.feedback[-REFINEMENT_FEEDBACK_KEPT:]
+            applied = "Feedback already applied (keep it): " + "; ".join(kept) + "\n"
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": f"Task: {self.task}"},
+            {"role": "assistant", "content": self.last_output},
+            {"role": "user", "content": f"{applied}Revise the {self.kind} above: {feedback}\n"
+                                        f"Keep the same format. Output only the revised {self.kind}."}
+        ]
+
+    def _messages_for(self, feedback):
+        if feedback is None or self.last_output is None:
+            return self.messages
+        return self.refine_messages(feedback)
+
+    def _accept(self, output, feedback):
+        self.last_output = output.strip()
+        if feedback is not None:
+            self.feedback.append(feedback)
+        return self.parse(self.last_output)
+
+    def generate(self, force_fresh=False):
+        return self.refine(None, force_fresh)
+
+    def refine(self, feedback, force_fresh=False):
+        with tracing.span("refinement.round", kind=self.kind, refinement=feedback is not None):
+            output = chat_completion(self._messages_for(feedback), temperature=self.temperature,
+                                     force_fresh=force_fresh)
+        return self._accept(output, feedback)
+
+    def stream(self, force_fresh=False):
+        return self.stream_refine(None, force_fresh)
+
+    def stream_refine(self, feedback, force_fresh=False):
+        # Yields chunks; the session only moves to the new version once the stream completes
+        parts = []
+        for chunk in stream_chat_completion(self._messages_for(feedback), temperature=self.temperature,
+                                            force_fresh=force_fresh):
+            parts.append(chunk)
+            yield chunk
+        self._accept("".join(parts), feedback)
+
+    def current(self):
+        return self.parse(self.last_output) if self.last_output is not None else None
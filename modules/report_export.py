@@ -0,0 +1,127 @@
+import os
+import re
+from modules.channel_tracker import crawl_channel_videos
+from modules.video_frame import VIDEO_COLUMNS, to_video_frame
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+
+
+def report_file_name(channel_title, extension, fallback="channel"):
+    # Channel titles can contain path separators and characters Windows rejects in file names
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]+', "_", channel_title or "").strip(" ._")[:100]
+    return f"{name or fallback}_report{extension}"
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _csv_ready(frame):
+    # Tags are written as one comma-separated cell, matching export_to_csv
+    return frame.assign(tags=frame["tags"].map(", ".join))
+
+
+def _chunks(video_details, chunk_rows):
+    frame = to_video_frame(video_details)
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+class CsvStreamWriter:
+    # Appends video chunks to a CSV file as they arrive; the header is written once
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.rows = 0
+
+    def write(self, video_details):
+        frame = to_video_frame(video_details)
+        _csv_ready(frame).to_csv(self.file, header=self.rows == 0, index=False, columns=list(VIDEO_COLUMNS))
+        self.rows += len(frame)
+
+    def close(self):
+        if self.rows == 0:
+            self.file.write(",".join(VIDEO_COLUMNS) + "\n")
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetStreamWriter:
+    # Writes each chunk as a compressed Parquet row group, so memory stays at one chunk
+    def __init__(self, path, compression="zstd"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow. Install it with: pip install pyarrow")
+        self.pa = pa
+        self.path = path
+        self.schema = pa.schema([
+            ("video_id", pa.string()),
+            ("title", pa.string()),
+            ("description", pa.string()),
+            ("tags", pa.list_(pa.string())),
+            ("published_at", pa.timestamp("us", tz="UTC")),
+            ("view_count", pa.int64()),
+            ("like_count", pa.int64())
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self.rows = 0
+
+    def write(self, video_details):
+        frame = to_video_frame(video_details)
+        table = self.pa.Table.from_pandas(frame.assign(tags=frame["tags"].map(list)), schema=self.schema,
+                                          preserve_index=False)
+        self.writer.write_table(table)
+        self.rows += len(frame)
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_csv_chunks(video_details, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Encoded CSV pieces for chunked HTTP responses / download streams
+    first = True
+    for chunk in _chunks(video_details, chunk_rows):
+        yield _csv_ready(chunk).to_csv(header=first, index=False, columns=list(VIDEO_COLUMNS)).encode("utf-8")
+        first = False
+    if first:
+        yield (",".join(VIDEO_COLUMNS) + "\n").encode("utf-8")
+
+
+def export_csv_file(video_details, path, chunk_rows=EXPORT_CHUNK_ROWS):
+    with CsvStreamWriter(path) as writer:
+        for chunk in _chunks(video_details, chunk_rows):
+            writer.write(chunk)
+    return path
+
+
+def export_parquet(video_details, path, compression="zstd", chunk_rows=EXPORT_CHUNK_ROWS):
+    with ParquetStreamWriter(path, compression=compression) as writer:
+        for chunk in _chunks(video_details, chunk_rows):
+            writer.write(chunk)
+    return path
+
+
+def export_channel_stream(playlist_id, path, fmt="csv", progress_callback=None, total_videos=None):
+    # Crawl straight to disk: each fetched stats chunk is written and dropped, never held as a whole
+    writer = ParquetStreamWriter(path) if fmt == "parquet" else CsvStreamWriter(path)
+    with writer:
+        crawl_channel_videos(playlist_id, progress_callback=progress_callback, total_videos=total_videos,
+                             sink=writer)
+    return writer.rows
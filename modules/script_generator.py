@@ -1,18 +1,15 @@
 import os
-import requests
 from dotenv import load_dotenv
+from modules import semantic_cache, tracing
+from modules.groq_client import MODEL, chat_completion, stream_chat_completion
+from modules.refinement import RefinementSession
 
 # Load environment variables
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
-MODEL = "llama3-70b-8192"
-
-def generate_script(video_idea, keywords=None, tone_feedback=None):
-    if not GROQ_API_KEY:
-        raise ValueError("GROQ_API_KEY not found in environment variables.")
 
+def _build_messages(video_idea, keywords=None, tone_feedback=None):
     keywords_str = ", ".join(keywords) if keywords else ""
     tone_instruction = f" Style: {tone_feedback}." if tone_feedback else ""
 
@@ -25,26 +22,66 @@ Make the language engaging and natural for a spoken video.
 {tone_instruction}
 Output should be clear and structured as a script."""
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": MODEL,
-        "messages": [
-            {"role": "system", "content": "You generate structured, audience-friendly YouTube scripts."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.8
-    }
-
-    response = requests.post(GROQ_API_URL, headers=headers, json=payload)
-
-    if response.status_code == 200:
-        return response.json()["choices"][0]["message"]["content"].strip()
-    else:
-        raise Exception(f"Error {response.status_code}: {response.text}")
+    return [
+        {"role": "system", "content": "You generate structured, audience-friendly YouTube scripts."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _semantic_scope(tone_feedback):
+    return semantic_cache.make_scope("script", MODEL, 0.8, tone_feedback)
+
+
+def find_similar_script(video_idea, keywords=None, tone_feedback=None):
+    # A script written earlier for a near-identical idea, or None
+    hit = semantic_cache.lookup(_semantic_scope(tone_feedback), semantic_cache.request_text(video_idea, keywords))
+    return dict(hit, value=hit["value"].strip()) if hit else None
+
+
+@tracing.traced("generate.script")
+def generate_script(video_idea, keywords=None, tone_feedback=None, force_fresh=False, semantic=True):
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY not found in environment variables.")
+
+    messages = _build_messages(video_idea, keywords, tone_feedback)
+    content = semantic_cache.cached_call(
+        _semantic_scope(tone_feedback),
+        semantic_cache.request_text(video_idea, keywords),
+        lambda: chat_completion(messages, temperature=0.8, force_fresh=force_fresh),
+        force_fresh=force_fresh,
+        semantic=semantic
+    )
+    return content.strip()
+
+
+def stream_script(video_idea, keywords=None, tone_feedback=None, force_fresh=False, semantic=True):
+    # Same prompt as generate_script, but yields text chunks as soon as Groq sends them
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY not found in environment variables.")
+
+    messages = _build_messages(video_idea, keywords, tone_feedback)
+    return semantic_cache.cached_stream(
+        _semantic_scope(tone_feedback),
+        semantic_cache.request_text(video_idea, keywords),
+        lambda: stream_chat_completion(messages, temperature=0.8, force_fresh=force_fresh),
+        force_fresh=force_fresh,
+        semantic=semantic
+    )
+
+
+def start_script_session(video_idea, keywords=None, tone_feedback=None):
+    # Generate (or stream) once, then refine() with feedback instead of regenerating from the full prompt
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY not found in environment variables.")
+
+    keywords_str = ", ".join(keywords) if keywords else "none"
+    return RefinementSession(
+        _build_messages(video_idea, keywords, tone_feedback),
+        task=f'spoken YouTube script for "{video_idea}" (keywords: {keywords_str}): '
+             f'hook/intro, 3–5 main points, conclusion/CTA',
+        kind="script",
+        temperature=0.8
+    )
 
 
 # ▶️ Interactive CLI
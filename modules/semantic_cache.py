@@ -0,0 +1,294 @@
+import os
+import re
+import json
+import math
+import time
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from dotenv import load_dotenv
+from modules import tracing
+
+load_dotenv()
+
+# Near-identical requests ("iphone 16 review" vs "review of the iPhone 16") reuse an earlier generation
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", os.path.join(".cache", "semantic_cache.sqlite3"))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", str(7 * 24 * 3600)))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2000"))
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+HASH_DIMENSIONS = 1 << 20
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how i in is it its my of on or our the this to vs what why with you your"
+    .split()
+)
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+_DIGITS = re.compile(r"\d")
+
+_conn = None
+_lock = threading.Lock()
+_scopes = {}
+_stats = {"hits": 0, "misses": 0, "stores": 0}
+
+
+def normalize_tokens(text):
+    # Lowercase words without stopwords, with a light plural strip ("reviews" -> "review")
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def normalized_key(text):
+    # Texts with the same key are the same request to the index (word order is ignored too)
+    return " ".join(sorted(normalize_tokens(text)))
+
+
+def _features(tokens):
+    # Hashed word unigrams plus in-word character trigrams (robust to "iphone16" / typos), word order ignored
+    counts = Counter()
+    for token in tokens:
+        counts[zlib.crc32(b"w:" + token.encode("utf-8")) % HASH_DIMENSIONS] += 1.0
+        padded = f"<{token}>"
+        for i in range(len(padded) - 2):
+            counts[zlib.crc32(b"c:" + padded[i:i + 3].encode("utf-8")) % HASH_DIMENSIONS] += 0.5
+    return counts
+
+
+class _ScopeIndex:
+    # TF-IDF vectors for one scope (generator + settings) with an inverted index for nearest-neighbour search
+    def __init__(self):
+        self.entries = {}
+        self.by_key = {}
+        self.postings = {}
+        self.doc_freq = Counter()
+        self.weighted_at = 0
+
+    def _idf(self, feature):
+        return math.log((1 + len(self.entries)) / (1 + self.doc_freq.get(feature, 0))) + 1
+
+    def _vector(self, counts):
+        vector = {feature: (1 + math.log(tf)) * self._idf(feature) for feature, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {feature: w / norm for feature, w in vector.items()}
+
+    def add(self, entry_id, text, value, created_at):
+        tokens = normalize_tokens(text)
+        counts = _features(tokens)
+        self.doc_freq.update(counts.keys())
+        self.entries[entry_id] = {
+            "text": text,
+            "value": value,
+            "created_at": created_at,
+            "counts": counts,
+            "key": " ".join(sorted(tokens)),
+            "vector": None,
+            # Numbers must match exactly: "iphone 15" is not a cache hit for "iphone 16"
+            "numbers": frozenset(token for token in tokens if _DIGITS.search(token))
+        }
+        self.by_key[self.entries[entry_id]["key"]] = entry_id
+        for feature in counts:
+            self.postings.setdefault(feature, set()).add(entry_id)
+        # Stored vectors use the IDF of their insertion time; all are reweighted whenever the index doubles
+        if len(self.entries) >= 2 * max(self.weighted_at, 8):
+            self.reweight()
+        else:
+            self.entries[entry_id]["vector"] = self._vector(counts)
+
+    def reweight(self):
+        for entry in self.entries.values():
+            entry["vector"] = self._vector(entry["counts"])
+        self.weighted_at = len(self.entries)
+
+    def remove(self, entry_id):
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return
+        if self.by_key.get(entry["key"]) == entry_id:
+            del self.by_key[entry["key"]]
+        for feature in entry["counts"]:
+            self.doc_freq[feature] -= 1
+            postings = self.postings.get(feature)
+            if postings:
+                postings.discard(entry_id)
+
+    def nearest(self, text, not_before=0.0):
+        tokens = normalize_tokens(text)
+        counts = _features(tokens)
+        if not counts:
+            return None
+        numbers = frozenset(token for token in tokens if _DIGITS.search(token))
+        query = self._vector(counts)
+        # Dot products accumulated over the inverted index; entries sharing no feature are never touched
+        scores = Counter()
+        for feature, weight in query.items():
+            for entry_id in self.postings.get(feature, ()):
+                scores[entry_id] += weight * self.entries[entry_id]["vector"][feature]
+        best = None
+        for entry_id, score in scores.most_common():
+            entry = self.entries[entry_id]
+            # Expired entries are skipped, not fatal: the next-best one may still be valid
+            if entry["numbers"] == numbers and entry["created_at"] >= not_before:
+                best = (score, entry_id)
+                break
+        if best is None:
+            return None
+        entry = self.entries[best[1]]
+        return {
+            "similarity": best[0],
+            "text": entry["text"],
+            "value": entry["value"],
+            "created_at": entry["created_at"]
+        }
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(SEMANTIC_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(SEMANTIC_CACHE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS semantic_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scope TEXT NOT NULL,
+                text TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_semantic_scope ON semantic_entries(scope, created_at)")
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def request_text(text, keywords=None):
+    # The free-text part of a request: the idea plus any keywords
+    if isinstance(keywords, str):
+        keywords = keywords.split(",")
+    return " ".join([text] + [kw.strip() for kw in keywords or [] if kw and kw.strip()])
+
+
+def make_scope(*parts):
+    # Everything except the free text (generator, model, temperature, tone, ...) must match exactly
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+def _load_scope(scope):
+    index = _scopes.get(scope)
+    if index is None:
+        index = _ScopeIndex()
+        conn = _get_conn()
+        cutoff = time.time() - SEMANTIC_CACHE_TTL
+        conn.execute("DELETE FROM semantic_entries WHERE scope = ? AND created_at < ?", (scope, cutoff))
+        rows = conn.execute(
+            "SELECT id, text, value, created_at FROM semantic_entries WHERE scope = ? ORDER BY created_at",
+            (scope,)
+        ).fetchall()
+        superseded = []
+        for entry_id, text, value, created_at in rows:
+            # Rows written before upserts existed may repeat a request; the newest one wins
+            previous = index.by_key.get(normalized_key(text))
+            if previous is not None:
+                index.remove(previous)
+                superseded.append((previous,))
+            index.add(entry_id, text, value, created_at)
+        conn.executemany("DELETE FROM semantic_entries WHERE id = ?", superseded)
+        conn.commit()
+        index.reweight()
+        _scopes[scope] = index
+    return index
+
+
+def lookup(scope, text, threshold=None):
+    # Closest earlier request in the same scope, if at least `threshold` cosine-similar
+    if not SEMANTIC_CACHE_ENABLED or not text.strip():
+        return None
+    threshold = SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+    with tracing.span("semantic_cache.lookup") as span, _lock:
+        hit = _load_scope(scope).nearest(text, not_before=time.time() - SEMANTIC_CACHE_TTL)
+        if hit is None or hit["similarity"] < threshold:
+            _stats["misses"] += 1
+            return None
+        _stats["hits"] += 1
+        span.add("cache_hits")
+        span.set("similarity", round(hit["similarity"], 4))
+        return hit
+
+
+def store(scope, text, value):
+    if not SEMANTIC_CACHE_ENABLED or not text.strip():
+        return
+    now = time.time()
+    with _lock:
+        conn = _get_conn()
+        index = _load_scope(scope)
+        # Upsert by normalized text: a fresh generation replaces the old one instead of competing with it
+        previous = index.by_key.get(normalized_key(text))
+        if previous is not None:
+            conn.execute("DELETE FROM semantic_entries WHERE id = ?", (previous,))
+            index.remove(previous)
+        entry_id = conn.execute(
+            "INSERT INTO semantic_entries (scope, text, value, created_at) VALUES (?, ?, ?, ?)",
+            (scope, text, value, now)
+        ).lastrowid
+        index.add(entry_id, text, value, now)
+        # Oldest entries beyond the per-scope cap are dropped from disk and from the index
+        excess = len(index.entries) - SEMANTIC_CACHE_MAX_ENTRIES
+        if excess > 0:
+            oldest = sorted(index.entries, key=lambda i: index.entries[i]["created_at"])[:excess]
+            conn.executemany("DELETE FROM semantic_entries WHERE id = ?", [(i,) for i in oldest])
+            for i in oldest:
+                index.remove(i)
+        conn.commit()
+        _stats["stores"] += 1
+
+
+def cached_call(scope, text, generate, force_fresh=False, semantic=True):
+    # generate() runs only when no close-enough earlier request exists; its result is indexed for next time
+    if semantic and not force_fresh:
+        hit = lookup(scope, text)
+        if hit is not None:
+            return hit["value"]
+    value = generate()
+    store(scope, text, value)
+    return value
+
+
+def cached_stream(scope, text, make_stream, force_fresh=False, semantic=True):
+    # Streaming twin of cached_call: a hit is replayed as a single chunk
+    if semantic and not force_fresh:
+        hit = lookup(scope, text)
+        if hit is not None:
+            yield hit["value"]
+            return
+    parts = []
+    for chunk in make_stream():
+        parts.append(chunk)
+        yield chunk
+    store(scope, text, "".join(parts))
+
+
+def clear():
+    with _lock:
+        conn = _get_conn()
+        conn.execute("DELETE FROM semantic_entries")
+        conn.commit()
+        _scopes.clear()
+
+
+def cache_stats():
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
@@ -0,0 +1,151 @@
+import threading
+import functools
+from modules import tracing
+
+# Process-wide request coalescing: concurrent identical calls wait on one in-flight call and share its result.
+# Shared results (frames, lists) are handed to every caller as-is, so callers must treat them as read-only.
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Stream:
+    # Chunks from one source iterator, pumped on a background thread and replayed to every reader
+    def __init__(self):
+        self.chunks = []
+        self.finished = False
+        self.error = None
+        self.condition = threading.Condition()
+        # Readers still iterating; when the last one leaves, the pump stops and closes the source
+        self.readers = 0
+        self.cancelled = False
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.streams = {}
+        self.stats = {"executed": 0, "coalesced": 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            tracing.current_span().add("coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the key before waking waiters, so a later request starts a fresh call
+            with self.lock:
+                self.calls.pop(key, None)
+            call.done.set()
+
+    def stream(self, key, make_iterator):
+        # Generator over a shared stream: the first caller starts it, later callers join mid-way
+        # and first replay the chunks they missed
+        with self.lock:
+            stream = self.streams.get(key)
+            if stream is None:
+                stream = self.streams[key] = _Stream()
+                self.stats["executed"] += 1
+                threading.Thread(target=tracing.propagate(self._pump), args=(key, stream, make_iterator),
+                                 daemon=True).start()
+            else:
+                self.stats["coalesced"] += 1
+                tracing.current_span().add("coalesced")
+            stream.readers += 1
+        return self._read(key, stream)
+
+    def _pump(self, key, stream, make_iterator):
+        iterator = make_iterator()
+        try:
+            for chunk in iterator:
+                with stream.condition:
+                    stream.chunks.append(chunk)
+                    stream.condition.notify_all()
+                if stream.cancelled:
+                    # Closing the source generator closes the upstream HTTP response
+                    iterator.close()
+                    break
+        except BaseException as e:
+            stream.error = e
+        finally:
+            with self.lock:
+                if self.streams.get(key) is stream:
+                    del self.streams[key]
+            with stream.condition:
+                stream.finished = True
+                stream.condition.notify_all()
+
+    def _leave(self, key, stream):
+        with self.lock:
+            stream.readers -= 1
+            if stream.readers == 0 and not stream.finished:
+                # Nobody is listening: forget the key so a new request starts fresh, and stop the pump
+                stream.cancelled = True
+                if self.streams.get(key) is stream:
+                    del self.streams[key]
+
+    def _read(self, key, stream):
+        position = 0
+        try:
+            while True:
+                with stream.condition:
+                    while position >= len(stream.chunks) and not stream.finished:
+                        stream.condition.wait()
+                    pending = stream.chunks[position:]
+                    finished = stream.finished
+                for chunk in pending:
+                    yield chunk
+                position += len(pending)
+                if finished and position >= len(stream.chunks):
+                    if stream.error is not None:
+                        raise stream.error
+                    return
+        finally:
+            self._leave(key, stream)
+
+    def in_flight(self):
+        with self.lock:
+            return len(self.calls) + len(self.streams)
+
+
+group = SingleFlight()
+
+
+def coalesce(key_fn):
+    # Decorator: calls whose key_fn(*args, **kwargs) match share one execution
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return group.do((fn.__module__, fn.__qualname__, key_fn(*args, **kwargs)), fn, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def flight_stats():
+    with group.lock:
+        stats = dict(group.stats)
+    stats["in_flight"] = group.in_flight()
+    return stats
@@ -1,18 +1,15 @@
 import os
-import requests
 from dotenv import load_dotenv
+from modules import semantic_cache, tracing
+from modules.groq_client import MODEL, chat_completion
+from modules.refinement import RefinementSession
 
 # Load .env
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
-MODEL = "llama3-70b-8192"
-
-def suggest_youtube_tags(content_input, style_feedback=None):
-    if not GROQ_API_KEY:
-        raise ValueError("GROQ_API_KEY not found in environment variables.")
 
+def _build_messages(content_input, style_feedback=None):
     style_instruction = f" Style: {style_feedback}." if style_feedback else ""
 
     prompt = f"""You are an expert YouTube SEO optimizer.
@@ -21,27 +18,49 @@ The tags should be short, lowercase, comma-separated, and relevant to the conten
 Content: "{content_input}"{style_instruction}
 Output only the tags as a comma-separated list. No extra explanation."""
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": MODEL,
-        "messages": [
-            {"role": "system", "content": "You generate trending and relevant YouTube tags."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7
-    }
-
-    response = requests.post(GROQ_API_URL, headers=headers, json=payload)
-
-    if response.status_code == 200:
-        content = response.json()["choices"][0]["message"]["content"]
-        return content.strip()
-    else:
-        raise Exception(f"Error {response.status_code}: {response.text}")
+    return [
+        {"role": "system", "content": "You generate trending and relevant YouTube tags."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _semantic_scope(style_feedback):
+    return semantic_cache.make_scope("tags", MODEL, 0.7, style_feedback)
+
+
+def find_similar_tags(content_input, style_feedback=None):
+    # Tags suggested earlier for near-identical content, or None
+    hit = semantic_cache.lookup(_semantic_scope(style_feedback), content_input)
+    return dict(hit, value=hit["value"].strip()) if hit else None
+
+
+@tracing.traced("generate.tags")
+def suggest_youtube_tags(content_input, style_feedback=None, force_fresh=False, semantic=True):
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY not found in environment variables.")
+
+    messages = _build_messages(content_input, style_feedback)
+    content = semantic_cache.cached_call(
+        _semantic_scope(style_feedback),
+        content_input,
+        lambda: chat_completion(messages, temperature=0.7, force_fresh=force_fresh),
+        force_fresh=force_fresh,
+        semantic=semantic
+    )
+    return content.strip()
+
+
+def start_tag_session(content_input):
+    # Generate once, then refine() with feedback instead of regenerating from the full prompt
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY not found in environment variables.")
+
+    return RefinementSession(
+        _build_messages(content_input),
+        task=f'top 15 lowercase, comma-separated YouTube tags for: "{content_input[:200]}"',
+        kind="tags",
+        temperature=0.7
+    )
 
 
 # ▶️ Interactive test
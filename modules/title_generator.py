@@ -1,19 +1,15 @@
 import os
-import requests
 from dotenv import load_dotenv
+from modules import semantic_cache, tracing
+from modules.groq_client import MODEL, chat_completion
+from modules.refinement import RefinementSession
 
 # Load environment variables from .env file
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-# Groq API details
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
-MODEL = "llama3-70b-8192"
-
-def generate_youtube_titles(video_idea, keywords=None, n_titles=5, style_feedback=None):
-    if not GROQ_API_KEY:
-        raise ValueError("GROQ_API_KEY not found in environment variables.")
 
+def _build_messages(video_idea, keywords=None, n_titles=5, style_feedback=None):
     keywords_str = ", ".join(keywords) if keywords else ""
 
     # Add style to prompt if provided
@@ -25,24 +21,54 @@ Idea: "{video_idea}"
 Keywords to include: {keywords_str}.{style_instruction}
 Make them engaging, short, and optimized for high CTR."""
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": MODEL,
-        "messages": [
-            {"role": "system", "content": "You are an expert in creating viral YouTube video titles."},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.8
-    }
-
-    response = requests.post(GROQ_API_URL, headers=headers, json=payload)
-
-    if response.status_code == 200:
-        content = response.json()["choices"][0]["message"]["content"]
-        return content.strip().split("\n")
-    else:
-        raise Exception(f"Error {response.status_code}: {response.text}")
+    return [
+        {"role": "system", "content": "You are an expert in creating viral YouTube video titles."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _split_titles(content):
+    return content.strip().split("\n")
+
+
+def _semantic_scope(n_titles, style_feedback):
+    return semantic_cache.make_scope("titles", MODEL, 0.8, n_titles, style_feedback)
+
+
+def find_similar_titles(video_idea, keywords=None, n_titles=5, style_feedback=None):
+    # Titles generated earlier for a near-identical idea, or None
+    hit = semantic_cache.lookup(_semantic_scope(n_titles, style_feedback),
+                                semantic_cache.request_text(video_idea, keywords))
+    return dict(hit, value=_split_titles(hit["value"])) if hit else None
+
+
+@tracing.traced("generate.titles")
+def generate_youtube_titles(video_idea, keywords=None, n_titles=5, style_feedback=None, force_fresh=False,
+                            semantic=True):
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY not found in environment variables.")
+
+    messages = _build_messages(video_idea, keywords, n_titles, style_feedback)
+    content = semantic_cache.cached_call(
+        _semantic_scope(n_titles, style_feedback),
+        semantic_cache.request_text(video_idea, keywords),
+        lambda: chat_completion(messages, temperature=0.8, force_fresh=force_fresh),
+        force_fresh=force_fresh,
+        semantic=semantic
+    )
+    return _split_titles(content)
+
+
+def start_title_session(video_idea, keywords=None, n_titles=5):
+    # Generate once, then refine() with feedback instead of regenerating from the full prompt
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY not found in environment variables.")
+
+    keywords_str = ", ".join(keywords) if keywords else "none"
+    return RefinementSession(
+        _build_messages(video_idea, keywords, n_titles),
+        task=f'{n_titles} high-CTR YouTube titles for "{video_idea}" (keywords: {keywords_str}), one per line',
+        kind="titles",
+        temperature=0.8,
+        parse=_split_titles
+    )
@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import threading
+import functools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Finished spans are kept in memory for the summary panel; TRACE_LOG_PATH also appends them as JSON lines
+TRACING_ENABLED = os.getenv("TRACING_DISABLED", "").lower() not in ("1", "true", "yes")
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "5000"))
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH")
+TRACE_LOG_FORMAT = os.getenv("TRACE_LOG_FORMAT", "json")  # "json" (flat log records) or "otel" (OTLP-style spans)
+
+# Attributes that are summed per span name in summary()
+COUNTERS = ("bytes_in", "bytes_out", "retries", "prompt_tokens", "completion_tokens", "total_tokens", "cache_hits",
+            "coalesced", "hedges")
+
+_current = contextvars.ContextVar("current_span", default=None)
+_spans = deque(maxlen=TRACE_MAX_SPANS)
+_lock = threading.Lock()
+
+
+class Span:
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.phases = {}
+        self.status = "ok"
+        self.error = None
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def add(self, key, amount=1):
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds * 1000
+
+    @contextmanager
+    def phase(self, name):
+        # Times one step inside the span (request, parse, dataframe, ...)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - start)
+
+    def finish(self, error=None):
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+        _record(self)
+
+    def to_record(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+    def to_otel(self):
+        # Shape of an OTLP/JSON span, so the file can be replayed into a collector or viewer
+        def value(v):
+            if isinstance(v, bool):
+                return {"boolValue": v}
+            if isinstance(v, int):
+                return {"intValue": str(v)}
+            if isinstance(v, float):
+                return {"doubleValue": v}
+            return {"stringValue": str(v)}
+
+        attributes = [{"key": k, "value": value(v)} for k, v in self.attributes.items()]
+        attributes += [{"key": f"phase.{k}_ms", "value": value(round(ms, 3))} for k, ms in self.phases.items()]
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.start_ns + int(self.duration_ms * 1e6)),
+            "attributes": attributes,
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+
+
+class _NoopSpan:
+    def set(self, key, value):
+        pass
+
+    def add(self, key, amount=1):
+        pass
+
+    def add_phase(self, name, seconds):
+        pass
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def finish(self, error=None):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _record(span):
+    with _lock:
+        _spans.append(span)
+        if TRACE_LOG_PATH:
+            line = span.to_otel() if TRACE_LOG_FORMAT == "otel" else span.to_record()
+            with open(TRACE_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line, default=str) + "\n")
+
+
+@contextmanager
+def span(name, **attributes):
+    # Child of whatever span is active on this thread/context; nested calls build one trace tree
+    if not TRACING_ENABLED:
+        yield NOOP_SPAN
+        return
+    current = Span(name, _current.get(), attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        _current.reset(token)
+        current.finish(e)
+        raise
+    _current.reset(token)
+    current.finish()
+
+
+def start_span(name, **attributes):
+    # Detached span for generators: parented to the active span but never made current,
+    # because a generator's context changes would leak into whoever iterates it
+    if not TRACING_ENABLED:
+        return NOOP_SPAN
+    return Span(name, _current.get(), attributes)
+
+
+@contextmanager
+def activate(span):
+    # Makes a detached span current for a block that does not yield (e.g. one call inside a generator)
+    if span is NOOP_SPAN:
+        yield span
+        return
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+
+
+def current_span():
+    return _current.get() or NOOP_SPAN
+
+
+def traced(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(fn):
+    # Run fn on worker threads under the submitting thread's active span
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+
+def recent_spans(limit=None):
+    with _lock:
+        spans = list(_spans)
+    return spans[-limit:] if limit else spans
+
+
+def export_spans(fmt="json"):
+    # "json": one flat record per span; "otel": an OTLP/JSON resourceSpans document
+    spans = recent_spans()
+    if fmt == "otel":
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "youtube-assistant"}}]},
+            "scopeSpans": [{"scope": {"name": "modules.tracing"}, "spans": [s.to_otel() for s in spans]}]
+        }]}
+    return [s.to_record() for s in spans]
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summary():
+    # Per span name: calls, errors, latency percentiles, mean phase split and summed counters
+    groups = {}
+    for s in recent_spans():
+        groups.setdefault(s.name, []).append(s)
+    rows = []
+    for name, spans in groups.items():
+        durations = sorted(s.duration_ms for s in spans)
+        row = {
+            "span": name,
+            "calls": len(spans),
+            "errors": sum(s.status == "error" for s in spans),
+            "total_ms": round(sum(durations), 1),
+            "p50_ms": round(_percentile(durations, 0.5), 1),
+            "p95_ms": round(_percentile(durations, 0.95), 1),
+            "max_ms": round(durations[-1], 1)
+        }
+        phases = {}
+        for s in spans:
+            for phase, ms in s.phases.items():
+                phases[phase] = phases.get(phase, 0.0) + ms
+        for phase, ms in phases.items():
+            row[f"{phase}_ms"] = round(ms / len(spans), 1)
+        for counter in COUNTERS:
+            total = sum(s.attributes.get(counter, 0) for s in spans)
+            if total:
+                row[counter] = total
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def clear():
+    with _lock:
+        _spans.clear()
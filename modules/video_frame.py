@@ -0,0 +1,86 @@
+import sys
+import numpy as np
+import pandas as pd
+
+VIDEO_COLUMNS = ("video_id", "title", "description", "tags", "published_at", "view_count", "like_count")
+
+
+class VideoFrameBuilder:
+    # Accumulates video stats straight into per-column lists, then builds one typed DataFrame:
+    # int64 counts, UTC datetime64 timestamps and tags as tuples of interned strings.
+    def __init__(self):
+        self.columns = {name: [] for name in VIDEO_COLUMNS}
+        self._tag_pool = {}
+
+    def _intern_tags(self, tags):
+        pool = self._tag_pool
+        return tuple(pool.setdefault(tag, sys.intern(tag)) for tag in tags) if tags else ()
+
+    def add_items(self, items):
+        # Raw `videos` endpoint items (part=statistics,snippet)
+        columns = self.columns
+        for item in items:
+            snippet = item["snippet"]
+            statistics = item.get("statistics", {})
+            columns["video_id"].append(item["id"])
+            columns["title"].append(snippet["title"])
+            columns["description"].append(snippet.get("description", ""))
+            columns["tags"].append(self._intern_tags(snippet.get("tags")))
+            columns["published_at"].append(snippet["publishedAt"])
+            columns["view_count"].append(int(statistics.get("viewCount", 0)))
+            columns["like_count"].append(int(statistics.get("likeCount", 0)))
+
+    def add_rows(self, rows):
+        # Tuples in VIDEO_COLUMNS order (e.g. database rows) with tags as a list
+        columns = self.columns
+        for video_id, title, description, tags, published_at, view_count, like_count in rows:
+            columns["video_id"].append(video_id)
+            columns["title"].append(title)
+            columns["description"].append(description or "")
+            columns["tags"].append(self._intern_tags(tags))
+            columns["published_at"].append(published_at)
+            columns["view_count"].append(int(view_count or 0))
+            columns["like_count"].append(int(like_count or 0))
+
+    def add_records(self, records):
+        # Legacy list-of-dicts video stats
+        self.add_rows(tuple(record[name] for name in VIDEO_COLUMNS) for record in records)
+
+    def __len__(self):
+        return len(self.columns["video_id"])
+
+    def build(self):
+        columns = self.columns
+        # Explicit str dtype: an empty list would otherwise become float64 and break every .str call
+        return pd.DataFrame({
+            "video_id": pd.Series(columns["video_id"], dtype=str),
+            "title": pd.Series(columns["title"], dtype=str),
+            "description": pd.Series(columns["description"], dtype=str),
+            "tags": pd.Series(columns["tags"], dtype=object),
+            "published_at": pd.to_datetime(pd.Series(columns["published_at"], dtype=object), utc=True),
+            "view_count": np.asarray(columns["view_count"], dtype=np.int64),
+            "like_count": np.asarray(columns["like_count"], dtype=np.int64)
+        }, columns=list(VIDEO_COLUMNS))
+
+
+def is_video_frame(video_details):
+    return isinstance(video_details, pd.DataFrame) and isinstance(
+        video_details.get("published_at", pd.Series(dtype=object)).dtype, pd.DatetimeTZDtype)
+
+
+def to_video_frame(video_details):
+    # Typed frames are shared as-is (no copy); anything else is converted once
+    if is_video_frame(video_details):
+        return video_details
+    builder = VideoFrameBuilder()
+    if isinstance(video_details, pd.DataFrame):
+        builder.add_records(video_details.to_dict("records"))
+    else:
+        builder.add_records(video_details)
+    return builder.build()
+
+
+def to_records(video_frame, columns=VIDEO_COLUMNS):
+    # Back to plain dicts, for the few consumers (prompts, JSON) that want them
+    frame = to_video_frame(video_frame)
+    return [dict(zip(columns, row)) for row in zip(*(frame[name].tolist() for name in columns))]
@@ -0,0 +1,36 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from modules import tracing
+from modules.title_generator import generate_youtube_titles
+from modules.description_generator import generate_youtube_description
+from modules.tag_suggester import suggest_youtube_tags
+from modules.script_generator import generate_script
+
+PACKAGE_PARTS = ("titles", "description", "tags", "script")
+
+
+@tracing.traced("generate.video_package")
+def generate_video_package(video_idea, keywords=None, tone=None, force_fresh=False):
+    # Fan out to all four generators at once so wall time is the slowest call, not the sum
+    keywords = keywords or []
+    tag_input = f"{video_idea} (keywords: {', '.join(keywords)})" if keywords else video_idea
+
+    tasks = {
+        "titles": (generate_youtube_titles, (video_idea, keywords), {"force_fresh": force_fresh}),
+        "description": (generate_youtube_description, (video_idea, keywords), {"force_fresh": force_fresh}),
+        "tags": (suggest_youtube_tags, (tag_input,), {"force_fresh": force_fresh}),
+        "script": (generate_script, (video_idea, keywords), {"tone_feedback": tone, "force_fresh": force_fresh})
+    }
+
+    package = {"video_idea": video_idea, "keywords": keywords, "errors": {}}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {name: executor.submit(tracing.propagate(fn), *args, **kwargs) for name, (fn, args, kwargs) in tasks.items()}
+        for name, future in futures.items():
+            try:
+                package[name] = future.result()
+            except Exception as e:
+                package[name] = None
+                package["errors"][name] = str(e)
+    package["elapsed_seconds"] = round(time.perf_counter() - start, 2)
+    return package
@@ -0,0 +1,94 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+YOUTUBE_HTTP_CACHE_PATH = os.getenv("YOUTUBE_HTTP_CACHE_PATH", os.path.join(".cache", "youtube_http.sqlite3"))
+YOUTUBE_HTTP_CACHE_MAX_ENTRIES = int(os.getenv("YOUTUBE_HTTP_CACHE_MAX_ENTRIES", "20000"))
+YOUTUBE_HTTP_CACHE_ENABLED = os.getenv("YOUTUBE_HTTP_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+_conn = None
+_lock = threading.Lock()
+# 304s still cost quota (the scheduler charges them like any call), so only requests and bytes are counted
+_stats = {"requests": 0, "not_modified": 0, "bytes_downloaded": 0, "bytes_saved": 0}
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(YOUTUBE_HTTP_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(YOUTUBE_HTTP_CACHE_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT NOT NULL,
+                body TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def make_key(endpoint, params):
+    # The API key is left out so rotating keys doesn't invalidate the cache
+    cacheable = {k: v for k, v in params.items() if k != "key"}
+    raw = json.dumps({"endpoint": endpoint, "params": cacheable}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def lookup(key):
+    if not YOUTUBE_HTTP_CACHE_ENABLED:
+        return None
+    with _lock:
+        row = _get_conn().execute("SELECT etag, body FROM responses WHERE key = ?", (key,)).fetchone()
+    return {"etag": row[0], "body": row[1]} if row else None
+
+
+def store(key, etag, body):
+    if not YOUTUBE_HTTP_CACHE_ENABLED:
+        return
+    with _lock:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, etag, body, last_access) VALUES (?, ?, ?, ?)",
+            (key, etag, body, time.time())
+        )
+        count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > YOUTUBE_HTTP_CACHE_MAX_ENTRIES:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (count - YOUTUBE_HTTP_CACHE_MAX_ENTRIES,)
+            )
+        conn.commit()
+
+
+def touch(key):
+    with _lock:
+        conn = _get_conn()
+        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        conn.commit()
+
+
+def record_response(endpoint, downloaded_bytes, not_modified=False, cached_bytes=0):
+    with _lock:
+        _stats["requests"] += 1
+        _stats["bytes_downloaded"] += downloaded_bytes
+        if not_modified:
+            _stats["not_modified"] += 1
+            _stats["bytes_saved"] += cached_bytes
+
+
+def cache_stats():
+    with _lock:
+        return dict(_stats)
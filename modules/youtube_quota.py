@@ -0,0 +1,191 @@
+import os
+import time
+import random
+import threading
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import requests
+from dotenv import load_dotenv
+from modules import tracing
+
+load_dotenv()
+
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+YOUTUBE_REQUESTS_PER_SECOND = float(os.getenv("YOUTUBE_REQUESTS_PER_SECOND", "10"))
+YOUTUBE_MAX_RETRIES = int(os.getenv("YOUTUBE_MAX_RETRIES", "4"))
+YOUTUBE_BACKOFF_BASE = float(os.getenv("YOUTUBE_BACKOFF_BASE", "1"))
+YOUTUBE_BACKOFF_CAP = float(os.getenv("YOUTUBE_BACKOFF_CAP", "30"))
+
+# Quota units charged per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+ENDPOINT_QUOTA_COSTS = {
+    "search": 100,
+    "channels": 1,
+    "playlistItems": 1,
+    "videos": 1
+}
+
+# The daily quota resets at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+RETRYABLE_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "backendError")
+EXHAUSTED_REASONS = ("quotaExceeded", "dailyLimitExceeded")
+
+
+class QuotaExceededError(Exception):
+    pass
+
+
+class YouTubeApiError(Exception):
+    # A final error response (after retries), so callers never parse an error body as an empty page
+    def __init__(self, endpoint, status_code, message):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status_code = status_code
+
+
+def _error_reason(response):
+    try:
+        errors = response.json().get("error", {}).get("errors", [])
+    except ValueError:
+        return ""
+    return errors[0].get("reason", "") if errors else ""
+
+
+def _api_error(endpoint, response, attempts):
+    try:
+        detail = response.json().get("error", {}).get("message", "")
+    except ValueError:
+        detail = ""
+    reason = _error_reason(response)
+    message = f"❌ YouTube API {endpoint} request failed with HTTP {response.status_code}"
+    if reason:
+        message += f" ({reason})"
+    if attempts > 1:
+        message += f" after {attempts} attempts"
+    if detail:
+        message += f": {detail}"
+    return YouTubeApiError(endpoint, response.status_code, message)
+
+
+class QuotaScheduler:
+    # Accounts quota units per endpoint against a daily budget, paces calls with a token bucket
+    # and retries transient failures with jittered exponential backoff.
+    def __init__(self, daily_quota=YOUTUBE_DAILY_QUOTA, requests_per_second=YOUTUBE_REQUESTS_PER_SECOND,
+                 burst=None, max_retries=YOUTUBE_MAX_RETRIES):
+        self.daily_quota = daily_quota
+        self.rate = requests_per_second
+        self.capacity = burst or max(requests_per_second, 1)
+        self.max_retries = max_retries
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+        self.day = self._today()
+        self.used = 0
+        self.by_endpoint = {}
+        self.retries = 0
+        self.exhausted = False
+
+    def _today(self):
+        return datetime.now(QUOTA_TIMEZONE).date()
+
+    def _reset_if_new_day(self):
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+            self.by_endpoint = {}
+            self.exhausted = False
+
+    def _reserve(self, endpoint):
+        cost = ENDPOINT_QUOTA_COSTS.get(endpoint, 1)
+        with self.lock:
+            self._reset_if_new_day()
+            if self.exhausted:
+                raise QuotaExceededError("❌ YouTube API quota exceeded for today. It resets at midnight Pacific time.")
+            if self.used + cost > self.daily_quota:
+                raise QuotaExceededError(
+                    f"❌ YouTube API daily quota budget reached ({self.used}/{self.daily_quota} units used). "
+                    f"It resets at midnight Pacific time."
+                )
+            self.used += cost
+            self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + cost
+
+    def _wait_for_token(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = random.uniform(0, min(YOUTUBE_BACKOFF_CAP, YOUTUBE_BACKOFF_BASE * 2 ** attempt))
+        with self.lock:
+            self.retries += 1
+        span = tracing.current_span()
+        span.add("retries")
+        span.add_phase("backoff", delay)
+        time.sleep(delay)
+
+    def execute(self, endpoint, send):
+        # send() performs the HTTP request; every attempt is charged because the API charges retries too
+        for attempt in range(self.max_retries + 1):
+            self._reserve(endpoint)
+            self._wait_for_token()
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._backoff(attempt)
+                continue
+
+            if response.status_code == 403:
+                reason = _error_reason(response)
+                if reason in EXHAUSTED_REASONS:
+                    with self.lock:
+                        self.exhausted = True
+                    raise QuotaExceededError(
+                        "❌ YouTube API quota exceeded for today. It resets at midnight Pacific time."
+                    )
+                if reason not in RETRYABLE_REASONS:
+                    raise _api_error(endpoint, response, attempt + 1)
+            elif response.status_code not in RETRYABLE_STATUS:
+                if response.status_code >= 400:
+                    raise _api_error(endpoint, response, attempt + 1)
+                return response
+
+            if attempt == self.max_retries:
+                raise _api_error(endpoint, response, attempt + 1)
+            self._backoff(attempt, response)
+
+    def remaining(self):
+        with self.lock:
+            self._reset_if_new_day()
+            tomorrow = datetime.combine(self.day + timedelta(days=1), datetime.min.time(), QUOTA_TIMEZONE)
+            return {
+                "daily_quota": self.daily_quota,
+                "used": self.used,
+                "remaining": 0 if self.exhausted else max(self.daily_quota - self.used, 0),
+                "by_endpoint": dict(self.by_endpoint),
+                "retries": self.retries,
+                "resets_at": tomorrow.isoformat()
+            }
+
+
+scheduler = QuotaScheduler()
+
+
+def quota_status():
+    return scheduler.remaining()
@@ -0,0 +1,38 @@
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from modules.video_frame import to_video_frame  # noqa: E402
+from modules.channel_tracker import metadata_optimization  # noqa: E402
+from modules.channel_compare import summarize_channel  # noqa: E402
+
+CHANNEL = {"channel_title": "Empty", "subscriber_count": 10, "video_count": 0, "view_count": 0}
+
+
+def test_empty_frame_has_text_columns():
+    videos = to_video_frame([])
+    assert videos.empty
+    assert videos["title"].str.strip().empty
+    assert videos["description"].str.strip().empty
+
+
+def test_metadata_optimization_on_empty_channel():
+    result = metadata_optimization(to_video_frame([]), period="M")
+    assert result["repeated_titles"] == []
+    assert result["missing_descriptions"] == 0
+    assert result["missing_tags"] == 0
+    assert result["common_hashtags"] == []
+    assert result["by_period"].empty
+
+
+def test_summarize_channel_on_empty_channel():
+    row = summarize_channel(CHANNEL, [])
+    assert row["Videos"] == 0
+    assert row["Top Video"] == ""
+    assert row["Top 5 Avg Views"] == 0
+    assert row["Repeated Titles"] == 0
+    assert row["Missing Descriptions"] == 0
+    assert row["Missing Tags"] == 0
+    assert row["Top Hashtag"] == ""
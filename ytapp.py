@@ -1,47 +1,104 @@
 import os
-import pandas as pd
+import json
+import tempfile
 import io
-import matplotlib.pyplot as plt
 import streamlit as st
-from modules.title_generator import generate_youtube_titles
-from modules.description_generator import generate_youtube_description
-from modules.tag_suggester import suggest_youtube_tags
-from modules.script_generator import generate_script
+from modules.title_generator import generate_youtube_titles, find_similar_titles
+from modules.description_generator import stream_youtube_description, find_similar_description
+from modules.tag_suggester import suggest_youtube_tags, find_similar_tags
+from modules.script_generator import stream_script, find_similar_script
+from modules.video_package import generate_video_package
+from modules import tracing
+from modules.llm_cache import cache_stats
+from modules.semantic_cache import cache_stats as semantic_cache_stats
+from modules.single_flight import flight_stats
+from modules.llm_resilience import resilience_status
+from modules.jobs import submit_job, job_status, job_stats, ACTIVE_STATUSES
+from modules.youtube_http_cache import cache_stats as youtube_cache_stats
+from modules.youtube_quota import quota_status
+from modules.channel_sync import sync_channel
+from modules.channel_compare import compare_channels
 from modules.channel_tracker import (
-    get_channel_data,
-    get_videos_from_playlist,
-    get_video_stats,
     analyze_channel_with_llm,
     show_top_5_videos,
     upload_frequency_chart,
-    metadata_optimization,
-    export_to_csv
+    metadata_optimization
 )
+from modules.near_duplicates import find_near_duplicate_videos
+from modules.report_export import export_csv_file, export_parquet, parquet_available, report_file_name
+
+def semantic_flow(find_similar, render, generate):
+    # A near-identical earlier request is shown at once; with "refresh near matches" on,
+    # a fresh result loads below it and replaces it when done
+    force_fresh = st.session_state.get("force_fresh", False)
+    hit = None if force_fresh else find_similar()
+    cached = st.empty()
+    if hit is not None:
+        with cached.container():
+            st.caption(f"⚡ Served from a similar earlier request (similarity {hit['similarity']:.2f} to \"{hit['text']}\")")
+            render(hit["value"])
+        if hit["similarity"] >= 0.999 or not st.session_state.get("semantic_refresh", False):
+            return
+    status = st.empty()
+    if hit is not None:
+        status.caption("🔄 Loading a fresh result...")
+    # The lookup above already missed or was shown, so skip the semantic lookup (the exact cache still applies)
+    render(generate(force_fresh=force_fresh, semantic=False))
+    cached.empty()
+    status.empty()
+
+def show_titles(titles):
+    st.write("### Suggested Titles:")
+    for i, title in enumerate(titles, 1):
+        st.write(f"{i}. {title.strip('-•123. ')}")
 
 def title_generator_flow():
     st.header("🎬 YouTube Title Generator")
     idea = st.text_input("Enter your video idea")
     keywords = st.text_input("Enter keywords (comma-separated)").split(",")
     if st.button("Generate Titles") and idea:
-        titles = generate_youtube_titles(idea, keywords)
-        st.write("### Suggested Titles:")
-        for i, title in enumerate(titles, 1):
-            st.write(f"{i}. {title.strip('-•123. ')}")
+        semantic_flow(
+            lambda: find_similar_titles(idea, keywords),
+            show_titles,
+            lambda **kw: generate_youtube_titles(idea, keywords, **kw)
+        )
+
+def show_description(description):
+    st.write("### Generated Description:")
+    # Cached results are plain text, fresh ones are streamed
+    if isinstance(description, str):
+        st.write(description)
+    else:
+        st.write_stream(description)
 
 def description_generator_flow():
     st.header("📄 YouTube Description Generator")
     idea = st.text_input("Enter your video idea or summary")
     keywords = st.text_input("Enter keywords (comma-separated)").split(",")
     if st.button("Generate Description") and idea:
-        desc = generate_youtube_description(idea, keywords)
-        st.text_area("Generated Description", desc, height=200)
+        semantic_flow(
+            lambda: find_similar_description(idea, keywords),
+            show_description,
+            lambda **kw: stream_youtube_description(idea, keywords, **kw)
+        )
 
 def tag_suggester_flow():
     st.header("🏷️ YouTube Tag Suggester")
     content = st.text_input("Enter your video title or description")
     if st.button("Suggest Tags") and content:
-        tags = suggest_youtube_tags(content)
-        st.text_area("Suggested Tags", tags)
+        semantic_flow(
+            lambda: find_similar_tags(content),
+            lambda tags: st.text_area("Suggested Tags", tags),
+            lambda **kw: suggest_youtube_tags(content, **kw)
+        )
+
+def show_script(script):
+    st.write("### Generated Script:")
+    # Cached results are plain text, fresh ones are streamed
+    if isinstance(script, str):
+        st.write(script)
+    else:
+        st.write_stream(script)
 
 def script_generator_flow():
     st.header("🎤 YouTube Script Generator")
@@ -49,63 +106,268 @@ def script_generator_flow():
     tone = st.text_input("Preferred tone/style (funny, serious, expert, etc.)")
     keywords = st.text_input("Enter keywords (comma-separated)").split(",")
     if st.button("Generate Script") and topic:
-        script = generate_script(topic, keywords, tone_feedback=tone)
-        st.text_area("Generated Script", script, height=300)
+        semantic_flow(
+            lambda: find_similar_script(topic, keywords, tone_feedback=tone),
+            show_script,
+            lambda **kw: stream_script(topic, keywords, tone_feedback=tone, **kw)
+        )
+
+def video_package_flow():
+    st.header("📦 Video Package Generator")
+    idea = st.text_input("Enter your video idea")
+    keywords = [kw.strip() for kw in st.text_input("Enter keywords (comma-separated)").split(",") if kw.strip()]
+    tone = st.text_input("Preferred script tone/style (optional)")
+    if st.button("Generate Package") and idea:
+        with st.spinner("Generating titles, description, tags and script together..."):
+            package = generate_video_package(idea, keywords, tone=tone or None,
+                                             force_fresh=st.session_state.get("force_fresh", False))
+        for part, error in package["errors"].items():
+            st.error(f"❌ {part} failed: {error}")
+        if package["titles"]:
+            st.write("### Suggested Titles:")
+            for i, title in enumerate(package["titles"], 1):
+                st.write(f"{i}. {title.strip('-•123. ')}")
+        if package["description"]:
+            st.text_area("Generated Description", package["description"], height=200)
+        if package["tags"]:
+            st.text_area("Suggested Tags", package["tags"])
+        if package["script"]:
+            st.text_area("Generated Script", package["script"], height=300)
+        st.caption(f"⏱️ Generated in {package['elapsed_seconds']}s")
+
+PERIODS = {"None": None, "Month": "M", "Quarter": "Q", "Year": "Y"}
+
+# Process-wide caches are shared by every session; analytics are keyed on channel id + sync time.
+# A finished channel job is reused for this long, so its result is the sync + LLM feedback cache.
+CHANNEL_CACHE_TTL = int(os.getenv("CHANNEL_CACHE_TTL", str(15 * 60)))
+
+@st.cache_data(ttl=CHANNEL_CACHE_TTL, show_spinner=False)
+def cached_metadata(channel_id, synced_at, top_n, period, similarity, _stats):
+    return (metadata_optimization(_stats, top_n=top_n, period=period),
+            find_near_duplicate_videos(_stats, threshold=similarity))
+
+@st.cache_data(ttl=CHANNEL_CACHE_TTL, show_spinner=False)
+def cached_frequency_chart(channel_id, synced_at, _stats):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    freq = upload_frequency_chart(_stats)
+    fig, ax = plt.subplots()
+    freq.plot(kind='bar', ax=ax)
+    ax.set_ylabel("Number of Videos")
+    png = io.BytesIO()
+    fig.savefig(png, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return png.getvalue()
+
+@st.cache_data(ttl=CHANNEL_CACHE_TTL, show_spinner=False)
+def cached_report_files(channel_id, synced_at, _stats):
+    report_base = os.path.join(tempfile.gettempdir(), f"{channel_id}_{int(synced_at)}_report")
+    csv_path = export_csv_file(_stats, report_base + ".csv")
+    parquet_path = export_parquet(_stats, report_base + ".parquet") if parquet_available() else None
+    return csv_path, parquet_path
+
+# How often a page with a running channel job polls it for progress (seconds)
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_PHASES = {"sync": "🔄 Syncing channel", "llm": "🤖 LLM analysis"}
+
+def channel_analysis_job(job, channel_input):
+    # Runs on a job worker, not the script thread, so it calls the modules directly (no Streamlit caches).
+    # The synced data is published as soon as it exists, so the page can show stats and charts
+    # while the LLM analysis is still running.
+    job.update("sync", 0.0, "Resolving channel...")
+
+    def report(progress):
+        total = max(progress["total_videos"] or progress["videos_listed"], 1)
+        job.update(progress=progress["videos_fetched"] / total,
+                   message=f"Pages: {progress['pages']} · Listed: {progress['videos_listed']} · "
+                           f"Stats fetched: {progress['videos_fetched']}")
+
+    channel, stats, sync = sync_channel(channel_input, progress_callback=report, as_frame=True)
+    job.update("llm", 0.0, "Analyzing every video in batches...", channel=channel, stats=stats, sync=sync)
+    feedback = analyze_channel_with_llm(
+        stats,
+        progress_callback=lambda done, total: job.update(progress=done / total, message=f"LLM steps: {done}/{total}")
+    )
+    return {"channel_input": channel_input, "channel": channel, "stats": stats, "sync": sync, "feedback": feedback}
+
+def channel_job(channel_input, fresh=False):
+    # The session only keeps a job id; the work lives in the job queue, so reruns and other widgets
+    # never wait on it, and sessions analyzing the same channel share one job
+    key = ("channel_analysis", channel_input)
+    status = job_status(st.session_state.get("channel_job"))
+    if status is None or status["key"] != key:
+        st.session_state["channel_job"] = submit_job("channel_analysis", channel_analysis_job, channel_input, key=key,
+                                                     reuse_finished=0 if fresh else CHANNEL_CACHE_TTL)
+        status = job_status(st.session_state["channel_job"])
+    return status
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_progress(job_id, shown_phase):
+    # Polls without rerunning the page; a full rerun happens when the job moves on, to render what it produced
+    status = job_status(job_id)
+    if status is None or status["status"] not in ACTIVE_STATUSES or status["phase"] != shown_phase:
+        st.rerun()
+    if status["status"] == "queued":
+        st.info(f"⏳ Waiting for a free worker ({job_stats()['running']} analyses running)...")
+        return
+    st.progress(status["progress"], text=f"{JOB_PHASES.get(status['phase'], status['phase'])}: {status['message']}")
+    finished = [f"✅ {JOB_PHASES.get(p['phase'], p['phase'])} {p['seconds']:.1f}s" for p in status["phases"]
+                if p["seconds"] is not None]
+    st.caption(" · ".join(finished + [f"⏱️ {status['elapsed_seconds']:.0f}s elapsed"]))
 
 def channel_tracker_flow():
     st.header("📊 YouTube Channel Performance Tracker")
     channel_input = st.text_input("Enter YouTube channel username or URL")
-    if st.button("Analyze Channel") and channel_input:
-        try:
-            channel = get_channel_data(channel_input)
-            st.success(f"Analyzing channel: {channel['channel_title']}")
-            st.write(f"**Created on:** {channel['published_at']}")
-            st.write(f"**Subscribers:** {channel['subscriber_count']} | **Videos:** {channel['video_count']} | **Views:** {channel['view_count']}")
-
-            videos_basic = get_videos_from_playlist(channel["uploads_playlist_id"])
-            video_ids = [v["video_id"] for v in videos_basic]
-            stats = get_video_stats(video_ids)
-
-            st.subheader("🥇 Top 5 Videos")
-            top_videos = show_top_5_videos(stats)
-            df_top = pd.DataFrame(top_videos)[["title", "view_count", "like_count", "published_at"]]
-            st.table(df_top.rename(columns={
-                "title": "Title",
-                "view_count": "Views",
-                "like_count": "Likes",
-                "published_at": "Published"
-            }))
-
-            st.subheader("📅 Upload Frequency")
-            freq = upload_frequency_chart(stats)
-            fig, ax = plt.subplots()
-            freq.plot(kind='bar', ax=ax)
-            ax.set_ylabel("Number of Videos")
-            st.pyplot(fig)
-
-            st.subheader("🧠 Metadata Optimization")
-            meta = metadata_optimization(stats)
-            if meta["repeated_titles"]:
-                st.warning(f"⚠️ Repeated Titles Detected: {', '.join(meta['repeated_titles'])}")
+    col_n, col_period, col_similarity = st.columns(3)
+    top_n = col_n.number_input("Top hashtags to show", min_value=1, max_value=50, value=5)
+    period_label = col_period.selectbox("Metadata breakdown period", list(PERIODS))
+    similarity = col_similarity.slider("Near-duplicate similarity threshold", 0.5, 1.0, 0.8, 0.05)
+
+    col_analyze, col_refresh = st.columns(2)
+    if col_analyze.button("Analyze Channel") and channel_input:
+        st.session_state["active_channel"] = channel_input.strip()
+        st.session_state.pop("channel_job", None)
+    refresh = col_refresh.button("🔄 Refresh data")
+    if refresh:
+        st.session_state.pop("channel_job", None)
+
+    active_channel = st.session_state.get("active_channel")
+    if not active_channel:
+        return
+
+    status = channel_job(active_channel, fresh=refresh)
+    if status["status"] in ("error", "cancelled"):
+        st.error(f"❌ Error: {status['error'] or 'analysis cancelled'}")
+        return
+    analysis = status["result"] or status["partial"]
+    if "stats" not in analysis:
+        job_progress(status["id"], status["phase"])
+        return
+
+    try:
+        channel, stats, sync = analysis["channel"], analysis["stats"], analysis["sync"]
+        channel_id, synced_at = channel["channel_id"], channel["synced_at"]
+
+        st.success(f"Analyzing channel: {channel['channel_title']}")
+        st.write(f"**Created on:** {channel['published_at']}")
+        st.write(f"**Subscribers:** {channel['subscriber_count']} | **Videos:** {channel['video_count']} | **Views:** {channel['view_count']}")
+        st.caption(f"🔄 Sync: {sync['new_videos']} new videos, {sync['refreshed_videos']} refreshed"
+                   + (" (first full crawl)" if sync["full_crawl"] else ""))
+        http_stats = youtube_cache_stats()
+        st.caption(f"🗄️ YouTube cache: {http_stats['not_modified']}/{http_stats['requests']} requests unchanged (304) · "
+                   f"{http_stats['bytes_saved'] / 1024:.0f} KB saved")
+        quota = quota_status()
+        st.caption(f"📉 YouTube quota: {quota['remaining']}/{quota['daily_quota']} units left today "
+                   f"({quota['retries']} retries so far)")
+
+        st.subheader("🥇 Top 5 Videos")
+        top_videos = show_top_5_videos(stats)
+        df_top = top_videos[["title", "view_count", "like_count", "published_at"]]
+        st.table(df_top.rename(columns={
+            "title": "Title",
+            "view_count": "Views",
+            "like_count": "Likes",
+            "published_at": "Published"
+        }))
+
+        st.subheader("📅 Upload Frequency")
+        st.image(cached_frequency_chart(channel_id, synced_at, stats))
+
+        st.subheader("🧠 Metadata Optimization")
+        meta, near_duplicates = cached_metadata(channel_id, synced_at, top_n, PERIODS[period_label], similarity, stats)
+        if meta["repeated_titles"]:
+            st.warning(f"⚠️ Repeated Titles Detected: {', '.join(meta['repeated_titles'])}")
+        else:
+            st.success("✅ All video titles are unique!")
+        for kind, label in (("titles", "titles"), ("descriptions", "descriptions")):
+            clusters = near_duplicates[kind]
+            if clusters:
+                st.warning(f"⚠️ {len(clusters)} groups of near-identical {label} (similarity ≥ {similarity:.2f})")
+                with st.expander(f"Show near-duplicate {label}"):
+                    for cluster in clusters[:20]:
+                        st.write(" · ".join(video["title"] for video in cluster))
             else:
-                st.success("✅ All video titles are unique!")
-            st.info(f"📝 Videos missing descriptions: {meta['missing_descriptions']}")
-            st.info(f"🏷️ Videos missing tags: {meta['missing_tags']}")
-            if meta['common_hashtags']:
-                st.write("### 📌 Most Common Hashtags:")
-                for tag, count in meta['common_hashtags']:
-                    st.write(f"{tag}: {count} times")
+                st.success(f"✅ No near-duplicate {label} found.")
+        st.info(f"📝 Videos missing descriptions: {meta['missing_descriptions']}")
+        st.info(f"🏷️ Videos missing tags: {meta['missing_tags']}")
+        if meta['common_hashtags']:
+            st.write("### 📌 Most Common Hashtags:")
+            for tag, count in meta['common_hashtags']:
+                st.write(f"{tag}: {count} times")
+        if "by_period" in meta:
+            st.write(f"### 🗓️ Breakdown by {period_label}:")
+            st.dataframe(meta["by_period"].rename(index=str), use_container_width=True)
+
+        st.subheader("📁 Download Report")
+        csv_path, parquet_path = cached_report_files(channel_id, synced_at, stats)
+        with open(csv_path, "rb") as csv_file:
+            st.download_button("Download CSV", csv_file, file_name=report_file_name(channel["channel_title"], ".csv"),
+                               mime="text/csv")
+        if parquet_path:
+            with open(parquet_path, "rb") as parquet_file:
+                st.download_button("Download Parquet (compressed)", parquet_file,
+                                   file_name=report_file_name(channel["channel_title"], ".parquet"),
+                                   mime="application/vnd.apache.parquet")
+
+        st.subheader("🤖 LLM Insights")
+        if status["status"] == "done":
+            st.text_area("LLM Feedback", analysis["feedback"], height=300)
+        else:
+            job_progress(status["id"], status["phase"])
+
+    except Exception as e:
+        st.error(f"❌ Error: {e}")
 
-            st.subheader("📁 Download CSV Report")
-            csv = export_to_csv(stats, channel["channel_title"])
-            st.download_button("Download CSV", csv, file_name="channel_report.csv", mime="text/csv")
+def channel_comparison_flow():
+    st.header("📈 Multi-Channel Comparison")
+    channels_text = st.text_area("Enter channel usernames or URLs (one per line)", height=200)
+    if st.button("Compare Channels") and channels_text.strip():
+        channel_inputs = [line for line in channels_text.splitlines() if line.strip()]
+        progress_bar = st.progress(0.0, text="Crawling channels...")
 
-            st.subheader("🤖 LLM Insights")
-            feedback = analyze_channel_with_llm(stats[:5])
-            st.text_area("LLM Feedback", feedback, height=300)
+        def report(done, total, channel_input):
+            progress_bar.progress(done / total, text=f"{done}/{total} channels done (last: {channel_input})")
 
-        except Exception as e:
-            st.error(f"❌ Error: {e}")
+        comparison, errors = compare_channels(channel_inputs, progress_callback=report)
+        progress_bar.empty()
+
+        for channel_input, error in errors.items():
+            st.error(f"❌ {channel_input}: {error}")
+        if not comparison.empty:
+            st.dataframe(comparison, use_container_width=True)
+            st.download_button("Download Comparison CSV", comparison.to_csv(index=False),
+                               file_name="channel_comparison.csv", mime="text/csv")
+
+def trace_panel():
+    # Where the time went in this process: per-span latency, phase split, bytes, tokens and retries
+    with st.sidebar.expander("⏱️ Performance trace"):
+        rows = tracing.summary()
+        if not rows:
+            st.caption("No traced calls yet.")
+            return
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+        fmt = st.radio("Export format", ["json", "otel"], horizontal=True, key="trace_format")
+        st.download_button("Download spans", json.dumps(tracing.export_spans(fmt), default=str),
+                           file_name=f"trace_{fmt}.json", mime="application/json")
+        if st.button("Clear trace"):
+            tracing.clear()
+            st.rerun()
+
+def resilience_panel():
+    # Live numbers for tuning LLM_DEADLINE / LLM_HEDGE_* / LLM_BREAKER_*
+    status = resilience_status()
+    if status["circuit"] == "open":
+        st.sidebar.warning(f"🚧 Groq circuit open: failing fast (cached answers only) for {status['retry_in_s']:.0f}s")
+    with st.sidebar.expander("🛡️ LLM resilience"):
+        st.caption(f"Circuit: {status['circuit']} · trips: {status['circuit_trips']} · "
+                   f"rejected: {status['rejected']} · deadline misses: {status['deadline_exceeded']}")
+        st.caption(f"Hedged: {status['hedges']} of {status['calls']} calls · hedge won: {status['hedge_wins']}")
+        if status["latency"]:
+            rows = [{"kind": kind, **numbers, "hedge_after_ms": status["hedge_delay_ms"].get(kind)}
+                    for kind, numbers in status["latency"].items()]
+            st.dataframe(rows, use_container_width=True, hide_index=True)
 
 def main():
     st.set_page_config(page_title="YouTube Assistant AI", layout="wide", initial_sidebar_state="expanded")
@@ -116,8 +378,21 @@ def main():
         "📄 Description Generator",
         "🏷️ Tag Suggester",
         "🎤 Script Generator",
-        "📊 Channel Tracker"
+        "📊 Channel Tracker",
+        "📦 Video Package",
+        "📈 Channel Comparison"
     ])
+    st.sidebar.checkbox("⚡ Force fresh generation (skip cache)", key="force_fresh")
+    stats = cache_stats()
+    st.sidebar.caption(f"🗄️ Generation cache: {stats['hits']} hits / {stats['misses']} misses")
+    st.sidebar.caption(f"🤝 Requests shared with other sessions: {flight_stats()['coalesced']}")
+    jobs = job_stats()
+    st.sidebar.caption(f"🧵 Background jobs: {jobs['running']} running · {jobs['queued']} queued "
+                       f"({jobs['workers']} workers)")
+    st.sidebar.checkbox("🔄 Refresh near matches (show similar cached result while a fresh one loads)",
+                        key="semantic_refresh")
+    semantic = semantic_cache_stats()
+    st.sidebar.caption(f"🧭 Similar-request cache: {semantic['hits']} hits / {semantic['misses']} misses")
 
     if choice == "🎬 Title Generator":
         title_generator_flow()
@@ -129,6 +404,14 @@ def main():
         script_generator_flow()
     elif choice == "📊 Channel Tracker":
         channel_tracker_flow()
+    elif choice == "📦 Video Package":
+        video_package_flow()
+    elif choice == "📈 Channel Comparison":
+        channel_comparison_flow()
+
+    # Rendered after the page so it includes the calls this run just made
+    resilience_panel()
+    trace_panel()
 
 if __name__ == "__main__":
     main()